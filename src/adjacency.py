@@ -0,0 +1,95 @@
+from array import array
+import numpy as np
+
+
+class Adjacency(object):
+    """The passages of a maze as a graph in compressed sparse row (CSR) form. Cells are identified
+    by their flat index row*num_cols + col. The cells reachable in one step from cell c are
+    neighbours[offsets[c]:offsets[c+1]], listed in the order top, right, bottom, left.
+
+    Attributes:
+        num_rows (int): The height of the maze
+        num_cols (int): The width of the maze
+        offsets (array): num_rows*num_cols + 1 offsets into neighbours
+        neighbours (array): The flat indices of the neighbours of all cells, one cell after the other
+    """
+
+    def __init__(self, num_rows, num_cols, offsets, neighbours):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.offsets = offsets
+        self.neighbours = neighbours
+
+    @classmethod
+    def from_wall_bits(cls, walls):
+        """Builds the graph from the walls of a maze. A cell is connected to a neighbour if the
+        wall on its side of the shared edge has been removed.
+
+        Args:
+            walls: A (num_rows, num_cols) array of wall bitmasks, see Maze.get_wall_bits
+        """
+        walls = np.asarray(walls, dtype=np.uint8)
+        num_rows, num_cols = walls.shape
+        flat = np.arange(num_rows*num_cols, dtype=np.int32).reshape(num_rows, num_cols)
+
+        # For every direction, which cells have an open passage and where it leads
+        is_open = np.zeros((num_rows, num_cols, 4), dtype=bool)
+        targets = np.empty((num_rows, num_cols, 4), dtype=np.int32)
+        for direction, step in enumerate((-num_cols, 1, num_cols, -1)):
+            is_open[..., direction] = (walls >> direction & 1) == 0
+            targets[..., direction] = flat + step
+        is_open[0, :, 0] = False      # Passages leaving the maze (entry and exit) are not edges
+        is_open[:, -1, 1] = False
+        is_open[-1, :, 2] = False
+        is_open[:, 0, 3] = False
+
+        offsets = np.zeros(num_rows*num_cols + 1, dtype=np.int32)
+        np.cumsum(is_open.sum(axis=2).ravel(), out=offsets[1:])
+        return cls(num_rows, num_cols, array("i", offsets.tobytes()), array("i", targets[is_open].tobytes()))
+
+    def neighbours_of(self, cell):
+        """Returns the flat indices of the cells that can be reached from cell in one step"""
+        return self.neighbours[self.offsets[cell]:self.offsets[cell+1]]
+
+    def degree(self, cell):
+        """Returns the number of passages leading out of cell"""
+        return self.offsets[cell+1] - self.offsets[cell]
+
+    def num_edges(self):
+        """Returns the number of passages, counting each passage once"""
+        return len(self.neighbours) // 2
+
+    def to_numpy(self):
+        """Returns (offsets, neighbours) as int32 NumPy arrays sharing memory with the graph,
+        e.g. for scipy.sparse.csr_matrix((data, neighbours, offsets))."""
+        return (np.frombuffer(self.offsets, dtype=np.int32),
+                np.frombuffer(self.neighbours, dtype=np.int32))
+
+    def edge_list(self):
+        """Returns a (num_edges, 2) int32 array with every passage as a pair of flat cell indices,
+        the smaller index first."""
+        offsets, neighbours = self.to_numpy()
+        sources = np.repeat(np.arange(self.num_rows*self.num_cols, dtype=np.int32), np.diff(offsets))
+        forward = sources < neighbours
+        return np.stack((sources[forward], neighbours[forward]), axis=1)
+
+    def save(self, filename):
+        """Saves the graph to a .npz file so it can be loaded by other tools without the maze.
+
+        Args:
+            filename (string): The name of the file
+        """
+        offsets, neighbours = self.to_numpy()
+        np.savez(filename, shape=np.array([self.num_rows, self.num_cols]), offsets=offsets, neighbours=neighbours)
+
+    @classmethod
+    def load(cls, filename):
+        """Loads a graph saved with Adjacency.save
+
+        Args:
+            filename (string): The name of the file
+        """
+        with np.load(filename) as data:
+            num_rows, num_cols = (int(size) for size in data["shape"])
+            return cls(num_rows, num_cols, array("i", data["offsets"].astype(np.int32).tobytes()),
+                       array("i", data["neighbours"].astype(np.int32).tobytes()))
@@ -1,167 +1,516 @@
 import time
 import random
 import math
+import numpy as np
+from array import array
+from src.cell import ALL_WALLS, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT, DIRECTION_OFFSETS, OPPOSITE
+from src.maze_path import MazePath
 
 # global variable to store list of all available algorithms
-algorithm_list = ["dfs_backtrack", "bin_tree"]
+algorithm_list = ["dfs_backtrack", "bin_tree", "eller", "kruskal", "wilson", "tiled_backtrack"]
+
+# Generators can report every step they take to a sink, a function called as sink(event, coor)
+# with the (row, col) of the cell the step ends in. The events are
+#   "start":     the first cell
+#   "carve":     a step into a cell that was not part of the maze yet
+#   "backtrack": a step back to a cell that was visited before
+#   "join":      the cell of the maze that a newly carved walk was connected to (wilson)
+
+def depth_first_recursive_backtracker( maze, start_coor, sink=None ):
+        """Carves the maze with the recursive backtracker, see _backtracker_steps.
+
+        Args:
+            maze (Maze): The maze to carve, with all walls up
+            start_coor (tuple): The (row, col) of the first cell
+            sink: Optional function receiving every step, see the events above
+        """
+        if not maze.quiet_mode:
+            print("\nGenerating the maze with depth-first search...")
+        time_start = time.time()
+
+        moves = 0
+        for event, coor in _backtracker_steps(maze, start_coor):
+            moves += 1
+            if sink is not None:
+                sink(event, coor)
+
+        if not maze.quiet_mode:
+            print("Number of moves performed: {}".format(moves))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+        _mark_entry_exit(maze)
 
-def depth_first_recursive_backtracker( maze, start_coor ):
+        maze.reset_visited()        # Set all cells to unvisited before returning grid
+
+def _backtracker_steps( maze, start_coor ):
+        """Carves the maze with depth-first search, moving to a random unvisited neighbour and
+        backtracking when there is none, and yields every step as (event, (row, col))."""
         k_curr, l_curr = start_coor             # Where to start generating
-        path = [(k_curr, l_curr)]               # To track path of solution
+        yield "start", (k_curr, l_curr)
         maze.grid[k_curr][l_curr].visited = True     # Set initial cell to visited
         visit_counter = 1                       # To count number of visited cells
         visited_cells = list()                  # Stack of visited cells for backtracking
 
-        print("\nGenerating the maze with depth-first search...")
-        time_start = time.time()
-
         while visit_counter < maze.grid_size:     # While there are unvisited cells
             neighbour_indices = maze.find_neighbours(k_curr, l_curr)    # Find neighbour indicies
             neighbour_indices = maze._validate_neighbours_generate(neighbour_indices)
 
             if neighbour_indices is not None:   # If there are unvisited neighbour cells
                 visited_cells.append((k_curr, l_curr))              # Add current cell to stack
-                k_next, l_next = random.choice(neighbour_indices)     # Choose random neighbour
+                k_next, l_next = maze.rng.choice(neighbour_indices)     # Choose random neighbour
                 maze.grid[k_curr][l_curr].remove_walls(k_next, l_next)   # Remove walls between neighbours
                 maze.grid[k_next][l_next].remove_walls(k_curr, l_curr)   # Remove walls between neighbours
                 maze.grid[k_next][l_next].visited = True                 # Move to that neighbour
                 k_curr = k_next
                 l_curr = l_next
-                path.append((k_curr, l_curr))   # Add coordinates to part of generation path
+                yield "carve", (k_curr, l_curr)
                 visit_counter += 1
 
             elif len(visited_cells) > 0:  # If there are no unvisited neighbour cells
                 k_curr, l_curr = visited_cells.pop()      # Pop previous visited cell (backtracking)
-                path.append((k_curr, l_curr))   # Add coordinates to part of generation path
+                yield "backtrack", (k_curr, l_curr)
 
-        print("Number of moves performed: {}".format(len(path)))
+def binary_tree( maze, start_coor, sink=None ):
+    """Carves a binary tree maze. Every cell opens a passage either downwards or to the right,
+    so all coin flips are drawn in one array operation and the wall bits are written in bulk.
+    The generation path is only created if someone accesses maze.generation_path."""
+    # store the current time
+    time_start = time.time()
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    rng = np.random.default_rng(maze.rng.getrandbits(64))
+
+    # for every cell, choose between carving down and carving right
+    carve_down = np.zeros((num_rows, num_cols), dtype=bool)
+    carve_down[:-1, :-1] = rng.integers(0, 2, size=(num_rows-1, num_cols-1), dtype=np.uint8)
+    carve_right = ~carve_down
+    # the last column can only carve down and the last row can only carve right
+    carve_down[:-1, -1] = True
+    carve_right[:-1, -1] = False
+    carve_right[-1, :-1] = True
+    carve_right[-1, -1] = False
+
+    # remove the walls on both sides of every carved passage
+    walls = np.full((num_rows, num_cols), ALL_WALLS, dtype=np.uint8)
+    walls -= carve_down*np.uint8(WALL_BOTTOM) + carve_right*np.uint8(WALL_RIGHT)
+    walls[1:] -= carve_down[:-1]*np.uint8(WALL_TOP)
+    walls[:, 1:] -= carve_right[:, :-1]*np.uint8(WALL_LEFT)
+    maze.set_wall_bits(walls)
+
+    if not maze.quiet_mode:
+        print("Number of moves performed: {}".format(maze.num_cols * maze.num_rows))
         print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
 
-        maze.grid[maze.entry_coor[0]][maze.entry_coor[1]].set_as_entry_exit("entry",
-            maze.num_rows-1, maze.num_cols-1)
-        maze.grid[maze.exit_coor[0]][maze.exit_coor[1]].set_as_entry_exit("exit",
-            maze.num_rows-1, maze.num_cols-1)
+    # choose the entry and exit coordinates
+    _mark_entry_exit(maze)
 
-        for i in range(maze.num_rows):
-            for j in range(maze.num_cols):
-                maze.grid[i][j].visited = False      # Set all cells to unvisited before returning grid
+    # every cell is connected to the cell below or to the right of it, so walking the
+    # passages from the bottom right cell reaches the whole maze
+    _walk_or_defer(maze, (num_rows-1, num_cols-1), sink)
 
-        maze.generation_path = path
 
-def binary_tree( maze, start_coor ):
-    # store the current time
+def eller( maze, start_coor, sink=None ):
+    """Carves the maze row by row with Eller's algorithm, see eller_rows."""
     time_start = time.time()
 
-    # repeat the following for all rows
-    for i in range(0, maze.num_rows):
+    walls = np.empty((maze.num_rows, maze.num_cols), dtype=np.uint8)
+    for i, row_walls in enumerate(eller_rows(maze.num_rows, maze.num_cols, maze.rng)):
+        walls[i] = np.frombuffer(row_walls, dtype=np.uint8)
+    maze.set_wall_bits(walls)
 
-        # check if we are in top row
-        if( i == maze.num_rows - 1 ):
-            # remove the right wall for this, because we cant remove top wall
-            for j in range(0, maze.num_cols-1):
-                maze.grid[i][j].remove_walls(i, j+1)
-                maze.grid[i][j+1].remove_walls(i, j)
+    if not maze.quiet_mode:
+        print("Number of moves performed: {}".format(maze.num_cols * maze.num_rows))
+        print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
 
-            # go to the next row
+    _mark_entry_exit(maze)
+    _walk_or_defer(maze, start_coor, sink)
+
+
+def eller_rows( num_rows, num_cols, rng=random ):
+    """Generates a perfect maze with Eller's algorithm, one row at a time. Only the set labels
+    of the current row are kept in memory, so mazes far larger than the available memory
+    can be streamed to a file or a renderer, e.g.
+
+        for row_walls in eller_rows(10000000, 1000):
+            stream.write(row_walls)
+
+    Args:
+        num_rows (int): The number of rows to generate
+        num_cols (int): The width of the maze, in cells
+        rng: The source of randomness, anything with the interface of the random module
+
+    Yields:
+        bytearray: The wall bitmask of every cell in the next row, see Cell.wall_bits
+    """
+    labels = list(range(num_cols))      # The set each cell of the current row belongs to
+    open_top = bytearray(num_cols)      # Cells that were carved into from the row above
+
+    for i in range(num_rows):
+        last_row = i == num_rows - 1
+        row_walls = bytearray([ALL_WALLS]) * num_cols
+        for j in range(num_cols):
+            if open_top[j]:
+                row_walls[j] &= ~WALL_TOP
+
+        # Labels are always smaller than num_cols, so a union-find over them needs O(width) memory
+        parent = list(range(num_cols))
+
+        def find(label):
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        # Randomly join neighbouring cells that belong to different sets. The last row joins
+        # every pair of different sets so that the maze ends up connected.
+        for j in range(num_cols - 1):
+            root, neighbour_root = find(labels[j]), find(labels[j+1])
+            if root != neighbour_root and (last_row or rng.getrandbits(1)):
+                parent[root] = neighbour_root
+                row_walls[j] &= ~WALL_RIGHT
+                row_walls[j+1] &= ~WALL_LEFT
+
+        if last_row:
+            yield row_walls
             break
 
-        # repeat the following for all cells in rows
-        for j in range(0, maze.num_cols):
-
-            # check if we are in the last column
-            if( j == maze.num_cols-1 ):
-                # remove only the top wall for this cell
-                maze.grid[i][j].remove_walls(i+1, j)
-                maze.grid[i+1][j].remove_walls(i, j)
-                continue
-
-            # for all other cells
-            # randomly choose between 0 and 1.
-            # if we get 0, remove top wall; otherwise remove right wall
-            remove_top = random.choice([True,False])
-
-            # if we chose to remove top wall
-            if remove_top:
-                maze.grid[i][j].remove_walls(i+1, j)
-                maze.grid[i+1][j].remove_walls(i, j)
-            # if we chose top remove right wall
-            else:
-                maze.grid[i][j].remove_walls(i, j+1)
-                maze.grid[i][j+1].remove_walls(i, j)
-
-    print("Number of moves performed: {}".format(maze.num_cols * maze.num_rows))
-    print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+        # Every set must continue downwards through at least one of its cells
+        roots = [find(label) for label in labels]
+        members = dict()
+        for j, root in enumerate(roots):
+            members.setdefault(root, list()).append(j)
+
+        open_top = bytearray(num_cols)
+        for cells in members.values():
+            forced = cells[rng.randrange(len(cells))]
+            for j in cells:
+                if j == forced or rng.getrandbits(1):
+                    row_walls[j] &= ~WALL_BOTTOM
+                    open_top[j] = 1
+
+        # Cells carved into keep the set of the cell above, the others start a new set
+        new_labels = dict()
+        for j in range(num_cols):
+            if open_top[j]:
+                labels[j] = new_labels.setdefault(roots[j], len(new_labels))
+        next_label = len(new_labels)
+        for j in range(num_cols):
+            if not open_top[j]:
+                labels[j] = next_label
+                next_label += 1
+
+        yield row_walls
+
+
+def kruskal( maze, start_coor, sink=None ):
+    """Carves the maze with randomized Kruskal's algorithm. Every wall between two cells is
+    an edge; the edges are shuffled once and a wall is removed whenever it separates two
+    cells that are not connected yet."""
+    time_start = time.time()
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    num_cells = num_rows*num_cols
+
+    # Edge 2*c joins cell c with the cell to its right, edge 2*c + 1 with the cell below it
+    edges = [2*c for c in range(num_cells) if c % num_cols != num_cols - 1]
+    edges.extend(2*c + 1 for c in range(num_cells - num_cols))
+    maze.rng.shuffle(edges)
+
+    sets = DisjointSet(num_cells)
+    walls = bytearray([ALL_WALLS]) * num_cells
+    carved = 0
+    for edge in edges:
+        if carved == num_cells - 1:     # The maze is a spanning tree, all other edges form loops
+            break
 
-    # choose the entry and exit coordinates
+        cell = edge >> 1
+        if edge & 1:
+            neighbour = cell + num_cols
+            if sets.union(cell, neighbour):
+                walls[cell] &= ~WALL_BOTTOM
+                walls[neighbour] &= ~WALL_TOP
+                carved += 1
+        else:
+            neighbour = cell + 1
+            if sets.union(cell, neighbour):
+                walls[cell] &= ~WALL_RIGHT
+                walls[neighbour] &= ~WALL_LEFT
+                carved += 1
+
+    maze.set_wall_bits(np.frombuffer(walls, dtype=np.uint8).reshape(num_rows, num_cols))
+
+    if not maze.quiet_mode:
+        print("Number of moves performed: {}".format(carved))
+        print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+    _mark_entry_exit(maze)
+    _walk_or_defer(maze, start_coor, sink)
+
+
+def wilson( maze, start_coor, sink=None ):
+    """Carves the maze with Wilson's algorithm, see _wilson_steps."""
+    time_start = time.time()
+
+    moves = 0
+    for event, coor in _wilson_steps(maze, start_coor):
+        moves += 1
+        if sink is not None:
+            sink(event, coor)
+
+    if not maze.quiet_mode:
+        print("Number of moves performed: {}".format(moves))
+        print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+    _mark_entry_exit(maze)
+
+
+def _wilson_steps( maze, start_coor ):
+    """Carves the maze with Wilson's algorithm, which picks uniformly among all perfect mazes.
+    Starting from a tree containing only start_coor, a random walk is made from every cell not
+    in the tree until it hits the tree. The walk stores the direction last taken out of each
+    cell in a flat array, so revisiting a cell overwrites its direction and erases the loop.
+    The loop-erased walk is then carved and added to the tree.
+
+    Yields the carved cells of every walk in order, followed by the tree cell the walk joins.
+    Consecutive steps of two different walks are not neighbours.
+    """
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    num_cells = num_rows*num_cols
+    step = (-num_cols, 1, num_cols, -1)     # Index offset of every direction
+    getrandbits = maze.rng.getrandbits
+
+    walls = bytearray([ALL_WALLS]) * num_cells
+    in_tree = bytearray(num_cells)
+    next_direction = bytearray(num_cells)   # Direction the walk last left each cell in
+    k_start, l_start = start_coor
+    in_tree[k_start*num_cols + l_start] = 1
+    yield "start", (k_start, l_start)
+
+    for start in range(num_cells):
+        if in_tree[start]:
+            continue
+
+        # Random walk until the tree is hit, only remembering the last exit of each cell
+        cell = start
+        while not in_tree[cell]:
+            k_curr, l_curr = divmod(cell, num_cols)
+            while True:
+                direction = getrandbits(2)
+                if ((direction == 0 and k_curr > 0) or (direction == 1 and l_curr < num_cols - 1)
+                        or (direction == 2 and k_curr < num_rows - 1) or (direction == 3 and l_curr > 0)):
+                    break
+            next_direction[cell] = direction
+            cell += step[direction]
+
+        # Carve the loop-erased walk into the tree
+        cell = start
+        while not in_tree[cell]:
+            direction = next_direction[cell]
+            walls[cell] &= ~(1 << direction)
+            in_tree[cell] = 1
+            yield "carve", divmod(cell, num_cols)
+            cell += step[direction]
+            walls[cell] &= ~(1 << OPPOSITE[direction])
+        yield "join", divmod(cell, num_cols)
+
+    maze.set_wall_bits(np.frombuffer(walls, dtype=np.uint8).reshape(num_rows, num_cols))
+
+
+class DisjointSet(object):
+    """Union-find over the integers 0..size-1, stored in flat arrays. Uses path halving
+    and union by rank, so any sequence of operations runs in near-linear time.
+
+    Attributes:
+        parent (array): The parent of every element, roots are their own parent
+        rank (bytearray): Upper bound on the height of the tree below every root
+    """
+
+    def __init__(self, size):
+        self.parent = array("i", range(size))
+        self.rank = bytearray(size)
+
+    def find(self, element):
+        """Returns the representative of the set that element belongs to"""
+        parent = self.parent
+        while parent[element] != element:
+            parent[element] = parent[parent[element]]
+            element = parent[element]
+        return element
+
+    def union(self, first, second):
+        """Merges the sets of first and second.
+
+        Return:
+            True: If the sets were merged
+            False: If first and second already were in the same set
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+
+        if self.rank[first] < self.rank[second]:
+            first, second = second, first
+        self.parent[second] = first
+        if self.rank[first] == self.rank[second]:
+            self.rank[first] += 1
+        return True
+
+
+def tiled_backtracker( maze, start_coor, sink=None, tile_size=64 ):
+    """Carves the maze tile by tile, for mazes far larger than the memory (see the "mmap" backend
+    of Maze). Every tile_size x tile_size tile is carved with the recursive backtracker in memory
+    and written to the grid once, tiles in row-major order, so a grid in a file is written in
+    bands of tile_size rows. The tiles are joined by a perfect maze over the tiles, streamed one
+    row of tiles at a time with eller_rows, through one passage in the border of every pair of
+    joined tiles. Mazes that fit in one tile are carved like depth_first_recursive_backtracker.
+    """
+    time_start = time.time()
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    tile_rows = (num_rows + tile_size - 1) // tile_size
+    tile_cols = (num_cols + tile_size - 1) // tile_size
+
+    bottom_doors = [0] * tile_cols      # Column within the tile of the passage down into the next band
+    for i, tile_walls in enumerate(eller_rows(tile_rows, tile_cols, maze.rng)):
+        row = i*tile_size
+        height = min(tile_size, num_rows - row)
+        top_doors, bottom_doors = bottom_doors, [0] * tile_cols
+        left_door = 0                   # Row within the tile of the passage from the tile to the left
+        for j in range(tile_cols):
+            col = j*tile_size
+            width = min(tile_size, num_cols - col)
+            walls = _backtrack_block(height, width, maze.rng)
+
+            if not tile_walls[j] & WALL_TOP:
+                walls[top_doors[j]] &= ~WALL_TOP
+            if not tile_walls[j] & WALL_LEFT:
+                walls[left_door*width] &= ~WALL_LEFT
+            if not tile_walls[j] & WALL_RIGHT:
+                left_door = maze.rng.randrange(height)
+                walls[left_door*width + width - 1] &= ~WALL_RIGHT
+            if not tile_walls[j] & WALL_BOTTOM:
+                bottom_doors[j] = maze.rng.randrange(width)
+                walls[(height - 1)*width + bottom_doors[j]] &= ~WALL_BOTTOM
+
+            maze.set_wall_bits(np.frombuffer(walls, dtype=np.uint8).reshape(height, width), row, col)
+
+    if not maze.quiet_mode:
+        print("Number of moves performed: {}".format(num_rows*num_cols))
+        print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+    _mark_entry_exit(maze)
+    _walk_or_defer(maze, start_coor, sink)
+
+
+def generation_steps( maze, algorithm, start_coor=(0, 0) ):
+    """Carves a maze that has all walls up and yields every step as (event, (row, col)), see the
+    events above. The steps of dfs_backtrack and wilson are yielded while the maze is carved, so
+    they can be consumed one at a time without keeping a list of them. The other algorithms carve
+    the whole maze first, then its passages are walked one step at a time. For an algorithm that is not in algorithm_list the passages the maze
+    already has are walked.
+
+    Args:
+        maze (Maze): The maze to carve
+        algorithm (string): The name of the algorithm, one of algorithm_list
+        start_coor (tuple): The (row, col) of the first cell
+    """
+    if algorithm == "dfs_backtrack":
+        yield from _backtracker_steps(maze, start_coor)
+        _mark_entry_exit(maze)
+        maze.reset_visited()
+    elif algorithm == "wilson":
+        yield from _wilson_steps(maze, start_coor)
+        _mark_entry_exit(maze)
+    elif algorithm in algorithm_list:
+        maze.generate_maze(algorithm, start_coor)
+        # The same walk the generators report to their sink, see _walk_or_defer
+        walk_start = (maze.num_rows-1, maze.num_cols-1) if algorithm == "bin_tree" else start_coor
+        yield from _tree_walk_steps(maze, walk_start)
+    else:
+        yield from _tree_walk_steps(maze, start_coor)
+
+
+def _backtrack_block( num_rows, num_cols, rng ):
+    """Carves a perfect maze of num_rows x num_cols cells with the recursive backtracker on flat
+    byte arrays and returns the wall bitmasks of all cells as a bytearray."""
+    num_cells = num_rows*num_cols
+    step = (-num_cols, 1, num_cols, -1)     # Index offset of every direction
+    walls = bytearray([ALL_WALLS]) * num_cells
+    visited = bytearray(num_cells)
+    visited[0] = 1
+    stack = [0]
+
+    while stack:
+        cell = stack[-1]
+        k, l = divmod(cell, num_cols)
+        directions = list()
+        if k > 0 and not visited[cell - num_cols]:
+            directions.append(0)
+        if l < num_cols - 1 and not visited[cell + 1]:
+            directions.append(1)
+        if k < num_rows - 1 and not visited[cell + num_cols]:
+            directions.append(2)
+        if l > 0 and not visited[cell - 1]:
+            directions.append(3)
+        if not directions:
+            stack.pop()             # Dead end, backtrack
+            continue
+
+        direction = rng.choice(directions)
+        neighbour = cell + step[direction]
+        walls[cell] &= ~(1 << direction)
+        walls[neighbour] &= ~(1 << OPPOSITE[direction])
+        visited[neighbour] = 1
+        stack.append(neighbour)
+
+    return walls
+
+
+def _mark_entry_exit( maze ):
+    """Opens the boundary walls of the entry and exit cells of the maze."""
     maze.grid[maze.entry_coor[0]][maze.entry_coor[1]].set_as_entry_exit("entry",
         maze.num_rows-1, maze.num_cols-1)
     maze.grid[maze.exit_coor[0]][maze.exit_coor[1]].set_as_entry_exit("exit",
         maze.num_rows-1, maze.num_cols-1)
 
-    # create a path for animating the maze creation using a binary tree
-    path = list()
-    # variable for holding number of cells visited until now
-    visit_counter = 0
-    # created list of cell visited uptil now to for backtracking
-    visited = list()
-
-    # create variables to hold the coords of current cell
-    # no matter what the user gives as start coords, we choose the
-    k_curr, l_curr = (maze.num_rows-1, maze.num_cols-1)
-    # add first cell to the path
-    path.append( (k_curr,l_curr) )
-
-    # mark first cell as visited
-    begin_time = time.time()
-
-    # repeat until all the cells have been visited
-    while visit_counter < maze.grid_size:     # While there are unvisited cells
-
-        # for each cell, we only visit top and right cells.
-        possible_neighbours = list()
-
-        try:
-            # take only those cells that are unvisited and accessible
-            if not maze.grid[k_curr-1][l_curr].visited and k_curr != 0:
-                if not maze.grid[k_curr][l_curr].is_walls_between(maze.grid[k_curr-1][l_curr]):
-                    possible_neighbours.append( (k_curr-1,l_curr))
-        except:
-            print()
-
-        try:
-            # take only those cells that are unvisited and accessible
-            if not maze.grid[k_curr][l_curr-1].visited and l_curr != 0:
-                if not maze.grid[k_curr][l_curr].is_walls_between(maze.grid[k_curr][l_curr-1]):
-                    possible_neighbours.append( (k_curr,l_curr-1))
-        except:
-            print()
-
-        # if there are still traversible cell from current cell
-        if len( possible_neighbours ) != 0:
-            # select to first element to traverse
-            k_next, l_next = possible_neighbours[0]
-            # add this cell to the path
-            path.append( possible_neighbours[0] )
-            # add this cell to the visited
-            visited.append( (k_curr,l_curr) )
-            # mark this cell as visited
-            maze.grid[k_next][l_next].visited = True
-
-            visit_counter+= 1
-
-            # update the current cell coords
-            k_curr, l_curr = k_next, l_next
 
+def _walk_or_defer( maze, start_coor, sink ):
+    """Registers a walk over the passages of a maze that was carved without a path as its
+    generation path, created on first access, and reports the steps of the walk to the sink."""
+    def builder():
+        path = MazePath.for_maze(maze)
+        path.extend(coor for _, coor in _tree_walk_steps(maze, start_coor))
+        return path
+
+    maze.defer_generation_path(builder)
+    if sink is not None:
+        for event, coor in _tree_walk_steps(maze, start_coor):
+            sink(event, coor)
+
+
+def _tree_walk_steps( maze, start_coor ):
+    """Walks the passages of an already carved maze depth-first from start_coor, backtracking
+    at dead ends, and yields the steps like _backtracker_steps."""
+    num_rows, num_cols = maze.num_rows, maze.num_cols
+    walls = maze.get_wall_bits().tobytes()
+    visited = bytearray(num_rows*num_cols)
+    k_curr, l_curr = start_coor
+    visited[k_curr*num_cols + l_curr] = 1
+    yield "start", (k_curr, l_curr)
+    visited_cells = list()                  # Stack of visited cells for backtracking
+
+    while True:
+        bits = walls[k_curr*num_cols + l_curr]
+        for direction, (k_step, l_step) in enumerate(DIRECTION_OFFSETS):
+            k_next, l_next = k_curr + k_step, l_curr + l_step
+            if (not bits >> direction & 1 and 0 <= k_next < num_rows and 0 <= l_next < num_cols
+                    and not visited[k_next*num_cols + l_next]):
+                break
         else:
-            # check if no more cells can be visited
-            if len( visited ) != 0:
-                k_curr, l_curr = visited.pop()
-                path.append( (k_curr,l_curr) )
-            else:
+            if len(visited_cells) == 0:     # Back at the start, every cell has been visited
                 break
-    for row in maze.grid:
-        for cell in row:
-            cell.visited = False
-
-    print(f"Generating path for maze took {time.time() - begin_time}s.")
-    maze.generation_path = path
+            k_curr, l_curr = visited_cells.pop()      # Pop previous visited cell (backtracking)
+            yield "backtrack", (k_curr, l_curr)
+            continue
+
+        visited_cells.append((k_curr, l_curr))
+        visited[k_next*num_cols + l_next] = 1
+        k_curr, l_curr = k_next, l_next
+        yield "carve", (k_curr, l_curr)
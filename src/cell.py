@@ -1,24 +1,77 @@
 
-class Cell(object):
-    """Class for representing a cell in a 2D grid.
+from collections.abc import MutableMapping
 
-        Attributes:
-            row (int): The row that this cell belongs to
-            col (int): The column that this cell belongs to
-            visited (bool): True if this cell has been visited by an algorithm
-            active (bool):
-            is_entry_exit (bool): True when the cell is the beginning or end of the maze
-            walls (list):
-            neighbours (list):
+# Bit used for each wall when the walls of a cell are packed into a single integer.
+WALL_TOP = 1
+WALL_RIGHT = 2
+WALL_BOTTOM = 4
+WALL_LEFT = 8
+ALL_WALLS = WALL_TOP | WALL_RIGHT | WALL_BOTTOM | WALL_LEFT
+WALL_BITS = {"top": WALL_TOP, "right": WALL_RIGHT, "bottom": WALL_BOTTOM, "left": WALL_LEFT}
+
+# Direction indices. The wall bit of a direction d is 1 << d.
+TOP, RIGHT, BOTTOM, LEFT = range(4)
+DIRECTION_OFFSETS = ((-1, 0), (0, 1), (1, 0), (0, -1))     # (row, col) offset of each direction
+OPPOSITE = (BOTTOM, LEFT, TOP, RIGHT)
+_OFFSET_DIRECTION = {offset: direction for direction, offset in enumerate(DIRECTION_OFFSETS)}
+
+
+class WallsView(MutableMapping):
+    """Dictionary-like view of the walls of a cell whose walls are stored as a bitmask.
+    Reading and writing the view reads and writes the wall_bits attribute of the owner,
+    so code written against the {"top": ..., "right": ..., ...} dict keeps working.
+
+    Attributes:
+        owner: The object holding the wall_bits attribute
     """
-    def __init__(self, row, col):
-        self.row = row
-        self.col = col
-        self.visited = False
-        self.active = False
-        self.is_entry_exit = None
-        self.walls = {"top": True, "right": True, "bottom": True, "left": True}
-        self.neighbours = list()
+    __slots__ = ("owner",)
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    def __getitem__(self, key):
+        return bool(self.owner.wall_bits & WALL_BITS[key])
+
+    def __setitem__(self, key, value):
+        if value:
+            self.owner.wall_bits |= WALL_BITS[key]
+        else:
+            self.owner.wall_bits &= ~WALL_BITS[key]
+
+    def __delitem__(self, key):
+        raise TypeError("Walls can not be deleted, set them to False instead")
+
+    def __iter__(self):
+        return iter(WALL_BITS)
+
+    def __len__(self):
+        return len(WALL_BITS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class WallMask(object):
+    """Wall operations shared by every cell type that keeps its walls in an integer bitmask.
+    Subclasses provide the row, col, wall_bits and is_entry_exit attributes.
+    """
+    __slots__ = ()
+
+    @property
+    def walls(self):
+        return WallsView(self)
+
+    def has_wall(self, direction):
+        """Returns True if the cell has a wall in the given direction (TOP, RIGHT, BOTTOM or LEFT)"""
+        return bool(self.wall_bits >> direction & 1)
+
+    def remove_wall(self, direction):
+        """Removes the wall in the given direction (TOP, RIGHT, BOTTOM or LEFT)"""
+        self.wall_bits &= ~(1 << direction)
+
+    def direction_to(self, neighbour_row, neighbour_col):
+        """Returns the direction of an adjacent cell, or None if the cell is not adjacent"""
+        return _OFFSET_DIRECTION.get((neighbour_row - self.row, neighbour_col - self.col))
 
     def is_walls_between(self, neighbour):
         """Function that checks if there are walls between self and a neighbour cell.
@@ -32,16 +85,11 @@ class Cell(object):
             False: If there are no walls in between the neighbors and self
 
         """
-        if self.row - neighbour.row == 1 and self.walls["top"] and neighbour.walls["bottom"]:
-            return True
-        elif self.row - neighbour.row == -1 and self.walls["bottom"] and neighbour.walls["top"]:
-            return True
-        elif self.col - neighbour.col == 1 and self.walls["left"] and neighbour.walls["right"]:
-            return True
-        elif self.col - neighbour.col == -1 and self.walls["right"] and neighbour.walls["left"]:
-            return True
+        direction = _OFFSET_DIRECTION.get((neighbour.row - self.row, neighbour.col - self.col))
+        if direction is None:
+            return False
 
-        return False
+        return bool(self.wall_bits >> direction & 1 and neighbour.wall_bits >> OPPOSITE[direction] & 1)
 
     def remove_walls(self, neighbour_row, neighbour_col):
         """Function that removes walls between neighbour cell given by indices in grid.
@@ -55,19 +103,12 @@ class Cell(object):
                 False: If the operation failed
 
         """
-        if self.row - neighbour_row == 1:
-            self.walls["top"] = False
-            return True, ""
-        elif self.row - neighbour_row == -1:
-            self.walls["bottom"] = False
-            return True, ""
-        elif self.col - neighbour_col == 1:
-            self.walls["left"] = False
-            return True, ""
-        elif self.col - neighbour_col == -1:
-            self.walls["right"] = False
-            return True, ""
-        return False
+        direction = _OFFSET_DIRECTION.get((neighbour_row - self.row, neighbour_col - self.col))
+        if direction is None:
+            return False
+
+        self.wall_bits &= ~(1 << direction)
+        return True, ""
 
     def set_as_entry_exit(self, entry_exit, row_limit, col_limit):
         """Function that sets the cell as an entry/exit cell by
@@ -82,12 +123,37 @@ class Cell(object):
         """
 
         if self.row == 0:
-            self.walls["top"] = False
+            self.wall_bits &= ~WALL_TOP
         elif self.row == row_limit:
-            self.walls["bottom"] = False
+            self.wall_bits &= ~WALL_BOTTOM
         elif self.col == 0:
-            self.walls["left"] = False
+            self.wall_bits &= ~WALL_LEFT
         elif self.col == col_limit:
-            self.walls["right"] = False
+            self.wall_bits &= ~WALL_RIGHT
 
         self.is_entry_exit = entry_exit
+
+
+class Cell(WallMask):
+    """Class for representing a cell in a 2D grid.
+
+        Attributes:
+            row (int): The row that this cell belongs to
+            col (int): The column that this cell belongs to
+            visited (bool): True if this cell has been visited by an algorithm
+            active (bool):
+            is_entry_exit (bool): True when the cell is the beginning or end of the maze
+            wall_bits (int): Bitmask of the walls of the cell, see WALL_BITS
+            walls (WallsView): Dictionary-like view of wall_bits, keyed by "top", "right", "bottom" and "left"
+            neighbours (list):
+    """
+    __slots__ = ("row", "col", "visited", "active", "is_entry_exit", "wall_bits", "neighbours")
+
+    def __init__(self, row, col):
+        self.row = row
+        self.col = col
+        self.visited = False
+        self.active = False
+        self.is_entry_exit = None
+        self.wall_bits = ALL_WALLS
+        self.neighbours = list()
@@ -0,0 +1,73 @@
+from array import array
+import numpy as np
+
+
+class CorridorGraph(object):
+    """The passage graph of a maze with its corridors contracted. Every cell that does not have
+    exactly two passages (junctions and dead ends), plus any cells that must be kept such as the
+    entry and exit, becomes a node. Each corridor of two-passage cells between two nodes becomes a
+    single edge weighted by its length in steps. Edges are stored in CSR form over node indices;
+    the cells of a corridor are not stored but recovered by walking it again.
+
+    Attributes:
+        adjacency (Adjacency): The passage graph of the maze
+        num_cols (int): The width of the maze
+        node_cells (array): The flat cell index (row*num_cols + col) of every node
+        node_of (array): The node index of every cell, -1 for cells inside a corridor
+        edge_offsets (array): The edges of node u are edge_offsets[u] to edge_offsets[u+1] - 1
+        edge_targets (array): The node every edge leads to
+        edge_lengths (array): The number of steps along every edge
+        edge_first_steps (array): The first cell entered when following every edge
+    """
+
+    def __init__(self, adjacency, keep=()):
+        self.adjacency = adjacency
+        self.num_cols = adjacency.num_cols
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
+
+        is_node = np.diff(np.frombuffer(offsets, dtype=np.int32)) != 2
+        for row, col in keep:
+            is_node[row*self.num_cols + col] = True
+        node_cells = np.flatnonzero(is_node).astype(np.int32)
+        node_of = np.full(len(is_node), -1, dtype=np.int32)
+        node_of[node_cells] = np.arange(len(node_cells), dtype=np.int32)
+        self.node_cells = array("i", node_cells.tobytes())
+        self.node_of = array("i", node_of.tobytes())
+
+        self.edge_offsets = array("i", [0])
+        self.edge_targets = array("i")
+        self.edge_lengths = array("i")
+        self.edge_first_steps = array("i")
+        for cell in self.node_cells:
+            for step in neighbours[offsets[cell]:offsets[cell+1]]:
+                length = 1
+                previous, current = cell, step
+                while self.node_of[current] < 0:    # Corridor cells have exactly two passages
+                    first, second = neighbours[offsets[current]:offsets[current+1]]
+                    previous, current = current, (second if first == previous else first)
+                    length += 1
+                self.edge_targets.append(self.node_of[current])
+                self.edge_lengths.append(length)
+                self.edge_first_steps.append(step)
+            self.edge_offsets.append(len(self.edge_targets))
+
+    def num_nodes(self):
+        """Returns the number of nodes of the contracted graph"""
+        return len(self.node_cells)
+
+    def corridor(self, node, edge):
+        """Returns the flat indices of the cells along an edge, excluding the node the edge starts
+        at and including the node it ends at.
+
+        Args:
+            node (int): The node the edge starts at
+            edge (int): The index of the edge
+        """
+        offsets, neighbours = self.adjacency.offsets, self.adjacency.neighbours
+        previous, current = self.node_cells[node], self.edge_first_steps[edge]
+        cells = [current]
+        while self.node_of[current] < 0:
+            first, second = neighbours[offsets[current]:offsets[current+1]]
+            previous, current = current, (second if first == previous else first)
+            cells.append(current)
+        return cells
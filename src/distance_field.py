@@ -0,0 +1,66 @@
+from array import array
+from collections import deque
+
+
+class DistanceField(object):
+    """The number of steps from a source cell to every cell of a maze, computed with one
+    breadth-first search over the passage graph. Distances are read in O(1) and a shortest
+    route from any cell to the source is recovered by walking down the distances.
+
+    Attributes:
+        source (tuple): The (row, col) of the source cell
+        num_cols (int): The width of the maze
+        distances (array): int32 distance of every cell (flat index row*num_cols + col), -1 if unreachable
+        adjacency (Adjacency): The passage graph the distances were computed on
+    """
+
+    def __init__(self, adjacency, source):
+        self.source = source
+        self.num_cols = adjacency.num_cols
+        self.adjacency = adjacency
+        self.distances = array("i", [-1]) * (adjacency.num_rows*adjacency.num_cols)
+
+        offsets, neighbours, distances = adjacency.offsets, adjacency.neighbours, self.distances
+        start = source[0]*self.num_cols + source[1]
+        distances[start] = 0
+        queue = deque([start])
+        while queue:
+            cell = queue.popleft()
+            distance = distances[cell] + 1
+            for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                if distances[neighbour] < 0:
+                    distances[neighbour] = distance
+                    queue.append(neighbour)
+
+    def distance(self, coor):
+        """Returns the number of steps between coor and the source, or -1 if there is no route
+
+        Args:
+            coor (tuple): The (row, col) of the cell
+        """
+        return self.distances[coor[0]*self.num_cols + coor[1]]
+
+    def path_to_source(self, coor):
+        """Returns a shortest route from coor to the source as a list of (row, col), found by
+        repeatedly stepping to a neighbour that is one step closer to the source.
+
+        Args:
+            coor (tuple): The (row, col) of the first cell of the route
+
+        Return:
+            list: The route including both ends, or None if the source can not be reached
+        """
+        offsets, neighbours, distances = self.adjacency.offsets, self.adjacency.neighbours, self.distances
+        cell = coor[0]*self.num_cols + coor[1]
+        if distances[cell] < 0:
+            return None
+
+        route = [divmod(cell, self.num_cols)]
+        while distances[cell] > 0:
+            closer = distances[cell] - 1
+            for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                if distances[neighbour] == closer:
+                    cell = neighbour
+                    break
+            route.append(divmod(cell, self.num_cols))
+        return route
@@ -1,9 +1,55 @@
 
 import random
 import math
+import os
+import sys
 import time
+import struct
+import hashlib
+import zlib
+from collections import OrderedDict
+import numpy as np
 from src.cell import Cell
-from src.algorithm import depth_first_recursive_backtracker, binary_tree
+from src.packed_grid import PackedGrid, MappedGrid
+from src.adjacency import Adjacency
+from src.distance_field import DistanceField
+from src.path_index import PathIndex
+from src.corridor_graph import CorridorGraph
+from src.maze_path import MazePath
+from src.algorithm import depth_first_recursive_backtracker, binary_tree, eller, kruskal, wilson, tiled_backtracker
+from src.algorithm import algorithm_list, generation_steps
+
+# Header of Maze.to_bytes: num_rows, num_cols, entry row, entry col, exit row, exit col
+_BYTES_HEADER = struct.Struct("<6I")
+
+# Header of the files written by Maze.save: magic, version, layout, flags, algorithm (index into
+# algorithm_list, 255 if unknown), num_rows, num_cols, entry row, entry col, exit row, exit col,
+# row and col of the cell the generator started at, seed
+_FILE_HEADER = struct.Struct("<4sBBBB8IQ")
+_FILE_MAGIC = b"PYMZ"
+_FILE_VERSION = 2
+LAYOUT_NIBBLES = 0      # Two cells per byte, the cell with the even flat index in the low nibble
+LAYOUT_BYTES = 1        # One byte per cell, so the walls can be memory mapped as a 2D array
+_HAS_SEED = 1
+_HAS_GENERATION_PATH = 2
+_HAS_SOLUTION_PATH = 4
+_HAS_WIDE_PATHS = 8     # The paths are stored as uint64, for mazes of 2**31 cells or more
+
+
+def derive_seed(base_seed, index):
+    """Derives the seed of one maze in a batch from the seed of the batch and the index of the
+    maze, so every maze gets its own random stream no matter in which order or process the
+    mazes are generated.
+
+    Args:
+        base_seed (int): The seed of the batch
+        index (int): The index of the maze in the batch
+
+    Return:
+        int: A 64 bit seed
+    """
+    digest = hashlib.sha256("{}:{}".format(base_seed, index).encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "little")
 
 
 class Maze(object):
@@ -17,29 +63,88 @@ class Maze(object):
         grid_size (int): The area of the maze, also the total number of Cells in the maze
         entry_coor Entry location cell of maze
         exit_coor Exit location cell of maze
-        generation_path : The path that was taken when generating the maze
-        solution_path : The path that was taken by a solver when solving the maze
+        generation_path : The path that was taken when generating the maze, a MazePath of (row, col)
+        record_generation_path (bool): Whether the generation path is kept while generating
+        quiet_mode (bool): When enabled, the generators do not output information to the console
+        solution_path : The path that was taken by a solver when solving the maze, a MazePath (or
+            list) of ((row, col), backtracked)
+        algorithm (string): The name of the generation algorithm
+        seed (int): The seed of rng, a maze is generated the same way again from the same seed
+        rng (random.Random): The source of randomness for generating the maze
+        distance_cache_size (int): How many distance fields are kept, see get_distance_field
+        backend (string): How the cells are stored, either "cells", "packed" or "mmap"
+        filename (string): The file holding the walls of an "mmap" maze
+        readonly (bool): Whether the file of an "mmap" maze is opened without write access
         initial_grid (list):
         grid (list): A copy of initial_grid (possible this is un-needed)
         """
 
-    def __init__(self, num_rows, num_cols, id=0, algorithm = "dfs_backtrack"):
+    def __init__(self, num_rows, num_cols, id=0, algorithm = "dfs_backtrack", backend="cells", seed=None,
+                 entry_coor=None, exit_coor=None, filename=None, record_generation_path=False, quiet_mode=False,
+                 readonly=False):
         """Creates a gird of Cell objects that are neighbors to each other.
 
             Args:
                     num_rows (int): The width of the maze, in cells
                     num_cols (int): The height of the maze in cells
                     id (id): An unique identifier
+                    algorithm (string): The name of the generation algorithm
+                    backend (string): "cells" stores one Cell object per position. "packed" stores
+                        all walls in a single byte array (see PackedGrid), which uses far less
+                        memory and is much faster to create for large mazes. "mmap" stores the walls
+                        in a file mapped into memory (see MappedGrid), for mazes larger than the memory
+                    seed (int): The seed for picking the entry and exit and generating the maze.
+                        Drawn from the random module if not given
+                    entry_coor (tuple): The (row, col) of the entry on the boundary, picked at random if not given
+                    exit_coor (tuple): The (row, col) of the exit on the boundary, picked at random if not given
+                    filename (string): The file of an "mmap" maze. It is written in the format of save
+                        with LAYOUT_BYTES. Without an algorithm, the walls of an existing file are used
+                    record_generation_path (bool): Whether to keep the steps of the generator as the
+                        generation path. Otherwise the path is created from the seed on first access
+                    quiet_mode (bool): When enabled, the generators do not output information to the console
+                    readonly (bool): Open the existing file of an "mmap" maze without write access. The
+                        walls can then not be changed, so no algorithm may be given
 
         """
+        if backend not in ("cells", "packed", "mmap"):
+            raise ValueError("Unknown grid backend: {}".format(backend))
+        if backend == "mmap" and filename is None:
+            raise ValueError("The mmap backend needs a filename")
+        if readonly and (backend != "mmap" or algorithm is not None):
+            raise ValueError("Only existing mmap mazes can be opened read-only")
+
         self.num_cols = num_cols
         self.num_rows = num_rows
         self.id = id
+        self.backend = backend
+        self.filename = filename
+        self.readonly = readonly
+        self.record_generation_path = record_generation_path
+        self.quiet_mode = quiet_mode
         self.grid_size = num_rows*num_cols
-        self.entry_coor = self._pick_random_entry_exit(None)
-        self.exit_coor = self._pick_random_entry_exit(self.entry_coor)
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self._seed_known = True     # False if the walls were not generated from seed, see load and from_bytes
+        self.algorithm = algorithm
+        # Always drawn, so the passages carved from a seed do not depend on the entry and exit
+        random_entry = self._pick_random_entry_exit(None)
+        random_exit = self._pick_random_entry_exit(random_entry)
+        self.entry_coor = tuple(entry_coor) if entry_coor is not None else random_entry
+        self.exit_coor = tuple(exit_coor) if exit_coor is not None else random_exit
+        for coor in (self.entry_coor, self.exit_coor):
+            if not self._is_on_boundary(coor):
+                raise ValueError("{} is not a cell on the boundary of the maze".format(coor))
+        if self.entry_coor == self.exit_coor:
+            raise ValueError("The entry and exit must be different cells")
+        self._generation_path_builder = None
+        self._start_coor = (0, 0)
         self.generation_path = []
         self.solution_path = None
+        self._adjacency = None
+        self._path_index = None
+        self._corridor_graph = None
+        self._distance_fields = OrderedDict()
+        self.distance_cache_size = 8
         self.initial_grid = self.generate_grid()
         self.grid = self.initial_grid
         self.generate_maze(algorithm, (0, 0))
@@ -49,10 +154,24 @@ class Maze(object):
         maze without any paths carved out
 
         Return:
-            A list with Cell objects at each position
+            A list with Cell objects at each position, or a PackedGrid when using the packed
+            or mmap backend
 
         """
 
+        if self.backend == "packed":
+            return PackedGrid(self.num_rows, self.num_cols)
+
+        if self.backend == "mmap":
+            create = self.algorithm is not None or not os.path.exists(self.filename)
+            if create and self.readonly:
+                raise ValueError("{} does not exist".format(self.filename))
+            if create:
+                with open(self.filename, "wb") as file:
+                    file.write(self._file_header(LAYOUT_BYTES, 0))
+                    file.truncate(_FILE_HEADER.size + self.grid_size)
+            return MappedGrid(self.filename, self.num_rows, self.num_cols, _FILE_HEADER.size, create, self.readonly)
+
         # Create an empty list
         grid = list()
 
@@ -65,6 +184,346 @@ class Maze(object):
 
         return grid
 
+    @property
+    def generation_path(self):
+        """The path that was taken when generating the maze. Unless it was recorded while generating,
+        it is replayed from the algorithm and seed on first access and kept until dropped again,
+        see drop_generation_path."""
+        if self._generation_path_builder is not None:
+            self._generation_path = self._generation_path_builder()
+            self._generation_path_builder = None
+        return self._generation_path
+
+    @generation_path.setter
+    def generation_path(self, path):
+        self._generation_path = path
+        self._generation_path_builder = None
+
+    def defer_generation_path(self, builder):
+        """Registers a function that creates the generation path the first time it is accessed.
+
+        Args:
+            builder: A function without arguments returning the generation path
+        """
+        self._generation_path = None
+        self._generation_path_builder = builder
+
+    def replay_generation_path(self):
+        """Makes the generation path be created by generating the maze again from its seed the
+        first time it is accessed, e.g. for a maze that was loaded without its generation path."""
+        def builder():
+            path = MazePath.for_maze(self)
+            path.extend(coor for _, coor in self.generation_steps())
+            return path
+
+        self.defer_generation_path(builder)
+
+    def drop_generation_path(self):
+        """Frees the generation path if it was created or recorded. It is replayed from the seed
+        again the next time it is accessed, so only the algorithm and seed are kept in memory. The
+        path of a maze whose seed is not known, e.g. one loaded from a file without a seed, is kept.
+
+        Return:
+            bool: Whether a path was dropped
+        """
+        if self._generation_path_builder is not None or not self._generation_path or not self._seed_known:
+            return False
+        self.replay_generation_path()
+        return True
+
+    def generation_steps(self):
+        """Yields the steps taken when generating the maze as (event, (row, col)), see
+        algorithm.generation_steps. The maze is generated again from its seed in a scratch grid,
+        so the steps can be streamed, e.g. to an animation or a file, without keeping the
+        generation path. For a maze of unknown origin or seed its passages are walked from (0, 0)."""
+        if self.algorithm not in algorithm_list or not self._seed_known:
+            yield from generation_steps(self, None)
+            return
+
+        scratch = Maze(self.num_rows, self.num_cols, 0, None, "packed", self.seed, quiet_mode=True)
+        yield from generation_steps(scratch, self.algorithm, self._start_coor)
+
+    def to_bytes(self):
+        """Returns the maze as a compact byte string: a small header with the size, entry and exit
+        followed by the wall bitmask of every cell as one byte. This is much smaller and faster to
+        pickle than the grid of Cell objects, e.g. for sending mazes to other processes. The
+        generation and solution paths are not included."""
+        header = _BYTES_HEADER.pack(self.num_rows, self.num_cols, self.entry_coor[0], self.entry_coor[1],
+                                    self.exit_coor[0], self.exit_coor[1])
+        return header + self.get_wall_bits().tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, id=0, backend="packed", seed=None):
+        """Creates a maze from a byte string made by to_bytes, without running a generator.
+
+        Args:
+            data (bytes): The serialized maze
+            id (int): An unique identifier for the new maze
+            backend (string): The grid backend of the new maze, see __init__
+            seed (int): The seed the serialized maze was generated from, if known. Without it the
+                generation path can not be replayed, the passages are walked instead
+
+        Return:
+            Maze: The maze with the walls, entry and exit of the serialized maze
+        """
+        num_rows, num_cols, k_entry, l_entry, k_exit, l_exit = _BYTES_HEADER.unpack_from(data)
+        walls = np.frombuffer(data, dtype=np.uint8, count=num_rows*num_cols, offset=_BYTES_HEADER.size)
+
+        maze = cls(num_rows, num_cols, id, algorithm=None, backend=backend, seed=seed,
+                   entry_coor=(k_entry, l_entry), exit_coor=(k_exit, l_exit))
+        maze.grid[k_entry][l_entry].is_entry_exit = "entry"
+        maze.grid[k_exit][l_exit].is_entry_exit = "exit"
+        maze.set_wall_bits(walls.reshape(num_rows, num_cols))
+        maze._seed_known = seed is not None
+        return maze
+
+    def nbytes(self):
+        """Returns an estimate of the number of bytes used by the grid and the generation and
+        solution paths, e.g. for keeping many mazes within a memory budget. The grid of an mmap
+        maze lives in files and is not counted"""
+        if self.backend != "cells":
+            size = self.grid.nbytes()
+        else:
+            cell = self.grid[0][0]
+            size = (self.grid_size*(sys.getsizeof(cell) + sys.getsizeof(cell.neighbours))
+                    + self.num_rows*sys.getsizeof(self.grid[0]))
+
+        for path in (self._generation_path, self.solution_path):
+            if isinstance(path, MazePath):
+                size += sys.getsizeof(path.values)
+            elif path:
+                size += sys.getsizeof(path) + 64*len(path)    # A list plus a small tuple per entry
+        return size
+
+    def save(self, filename, paths=True, layout=LAYOUT_NIBBLES):
+        """Saves the maze to a binary file. The file starts with a fixed size header holding the
+        format version, the size, entry, exit, generation algorithm and seed of the maze, followed
+        by the walls of all cells and, optionally, the zlib compressed generation and solution paths.
+
+        Args:
+            filename (string): The name of the file
+            paths (bool): Whether to store the paths. A generation path that has not been created
+                yet is never stored, it is replayed from the seed after loading (see load)
+            layout (int): LAYOUT_NIBBLES stores 4 bits per cell, LAYOUT_BYTES one byte per cell
+        """
+        flags = 0
+        walls = self.get_wall_bits().ravel()
+        if layout == LAYOUT_NIBBLES:
+            walls = np.append(walls, np.uint8(0)) if len(walls) % 2 else walls
+            walls = walls[0::2] | (walls[1::2] << 4)
+        elif layout != LAYOUT_BYTES:
+            raise ValueError("Unknown wall layout: {}".format(layout))
+
+        blocks = list()
+        wide = self.grid_size >= 2**31
+        if wide:
+            flags |= _HAS_WIDE_PATHS
+        if paths and self._generation_path_builder is None and self._generation_path:
+            flags |= _HAS_GENERATION_PATH
+            blocks.append(self._packed_path(self._generation_path, False, wide))
+        if paths and self.solution_path:
+            flags |= _HAS_SOLUTION_PATH
+            blocks.append(self._packed_path(self.solution_path, True, wide))
+
+        with open(filename, "wb") as file:
+            file.write(self._file_header(layout, flags))
+            file.write(walls.tobytes())
+            for block in blocks:
+                compressed = zlib.compress(block.astype("<u8" if wide else "<u4").tobytes())
+                file.write(struct.pack("<I", len(compressed)))
+                file.write(compressed)
+
+    def _packed_path(self, path, flags, wide):
+        """Returns the steps of a path as a uint32 (uint64 if wide) array in the format of MazePath"""
+        if (not isinstance(path, MazePath) or path.num_cols != self.num_cols or path.flags != flags
+                or path.is_wide() != wide):
+            path = MazePath.from_steps(path, self.num_cols, flags, wide)
+        return np.frombuffer(path.values, dtype=np.uint64 if wide else np.uint32)
+
+    def _file_header(self, layout, flags):
+        """Returns the header of the file format of save, see _FILE_HEADER"""
+        seed = 0
+        if self._seed_known and isinstance(self.seed, int) and 0 <= self.seed < 2**64:    # Other seeds are not stored
+            flags |= _HAS_SEED
+            seed = self.seed
+        algorithm = algorithm_list.index(self.algorithm) if self.algorithm in algorithm_list else 255
+        return _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, layout, flags, algorithm, self.num_rows, self.num_cols,
+                                 self.entry_coor[0], self.entry_coor[1], self.exit_coor[0], self.exit_coor[1],
+                                 self._start_coor[0], self._start_coor[1], seed)
+
+    @classmethod
+    def load(cls, filename, id=0, backend="packed", readonly=False):
+        """Loads a maze saved with save. If the file has no generation path but the seed and
+        algorithm of the maze are known, the generation path is replayed on first access.
+
+        Args:
+            filename (string): The name of the file
+            id (int): An unique identifier for the loaded maze
+            backend (string): The grid backend of the loaded maze, see __init__
+            readonly (bool): Whether to map the file of an "mmap" maze without write access
+
+        Return:
+            Maze: The loaded maze
+        """
+        with open(filename, "rb") as file:
+            (magic, version, layout, flags, algorithm, num_rows, num_cols, k_entry, l_entry,
+             k_exit, l_exit, k_start, l_start, seed) = _FILE_HEADER.unpack(file.read(_FILE_HEADER.size))
+            if magic != _FILE_MAGIC:
+                raise ValueError("{} is not a maze file".format(filename))
+            if version != _FILE_VERSION:
+                raise ValueError("Unsupported maze file version: {}".format(version))
+            if layout not in (LAYOUT_NIBBLES, LAYOUT_BYTES):
+                raise ValueError("Unknown wall layout: {}".format(layout))
+            if backend == "mmap" and layout != LAYOUT_BYTES:
+                raise ValueError("Only files saved with LAYOUT_BYTES can be memory mapped")
+
+            num_cells = num_rows*num_cols
+            if backend == "mmap":
+                walls = None    # The walls are mapped from the file by the grid
+                file.seek(num_cells, os.SEEK_CUR)
+            elif layout == LAYOUT_NIBBLES:
+                packed = np.frombuffer(file.read((num_cells + 1)//2), dtype=np.uint8)
+                walls = np.empty(len(packed)*2, dtype=np.uint8)
+                walls[0::2] = packed & 15
+                walls[1::2] = packed >> 4
+            else:
+                walls = np.frombuffer(file.read(num_cells), dtype=np.uint8)
+
+            blocks = list()
+            wide = bool(flags & _HAS_WIDE_PATHS)
+            dtype = np.uint64 if wide else np.uint32
+            for flag in (_HAS_GENERATION_PATH, _HAS_SOLUTION_PATH):
+                if flags & flag:
+                    size, = struct.unpack("<I", file.read(4))
+                    blocks.append(np.frombuffer(zlib.decompress(file.read(size)), dtype="<u8" if wide else "<u4"))
+                else:
+                    blocks.append(None)
+
+        maze = cls(num_rows, num_cols, id, algorithm=None, backend=backend,
+                   seed=seed if flags & _HAS_SEED else None,
+                   entry_coor=(k_entry, l_entry), exit_coor=(k_exit, l_exit),
+                   filename=filename if backend == "mmap" else None, readonly=readonly)
+        maze.algorithm = algorithm_list[algorithm] if algorithm < len(algorithm_list) else None
+        maze._start_coor = (k_start, l_start)
+        maze._seed_known = bool(flags & _HAS_SEED)
+        maze.grid[k_entry][l_entry].is_entry_exit = "entry"
+        maze.grid[k_exit][l_exit].is_entry_exit = "exit"
+        if walls is not None:
+            maze.set_wall_bits(walls[:num_cells].reshape(num_rows, num_cols))
+
+        generation, solution = blocks
+        if generation is not None:
+            maze.generation_path = MazePath(num_cols, False, generation.astype(dtype).tobytes(), wide)
+        elif flags & _HAS_SEED and maze.algorithm is not None:
+            maze.replay_generation_path()
+        if solution is not None:
+            maze.solution_path = MazePath(num_cols, True, solution.astype(dtype).tobytes(), wide)
+        return maze
+
+    def get_wall_bits(self):
+        """Returns the walls of all cells as a (num_rows, num_cols) uint8 array of wall bitmasks.
+        For the packed and mmap backends this is a view of the grid, otherwise a copy."""
+        if self.backend != "cells":
+            return self.grid.walls
+
+        return np.array([[cell.wall_bits for cell in row] for row in self.grid], dtype=np.uint8)
+
+    def adjacency(self):
+        """Returns the passage graph of the maze in compressed sparse row form (see Adjacency).
+        The graph is built on first use and cached. It is rebuilt after the maze is generated or
+        set_wall_bits is called; call invalidate_adjacency after changing walls of single cells."""
+        if self._adjacency is None:
+            self._adjacency = Adjacency.from_wall_bits(self.get_wall_bits())
+        return self._adjacency
+
+    def invalidate_adjacency(self):
+        """Drops the cached passage graph and everything computed from it (distance fields, path
+        index and corridor graph), so they are rebuilt from the walls on next use."""
+        self._adjacency = None
+        self._path_index = None
+        self._corridor_graph = None
+        self._distance_fields.clear()
+
+    def corridor_graph(self):
+        """Returns the passage graph with its corridors contracted into weighted edges, keeping
+        the entry and exit as nodes (see CorridorGraph). Built on first use and cached."""
+        if self._corridor_graph is None:
+            self._corridor_graph = CorridorGraph(self.adjacency(), (self.entry_coor, self.exit_coor))
+        return self._corridor_graph
+
+    def path_index(self):
+        """Returns an index answering distance and route queries between any two cells of the
+        maze (see PathIndex). Built on first use and cached. Only works for perfect mazes, which
+        all generators in algorithm_list produce."""
+        if self._path_index is None:
+            self._path_index = PathIndex(self.adjacency(), self.entry_coor)
+        return self._path_index
+
+    def get_distance_field(self, source=None):
+        """Returns the distances from a source cell to every cell (see DistanceField). The fields
+        of the distance_cache_size most recently used sources are cached.
+
+        Args:
+            source (tuple): The (row, col) of the source cell. Defaults to the exit of the maze
+        """
+        source = tuple(source) if source is not None else self.exit_coor
+        field = self._distance_fields.get(source)
+        if field is None:
+            field = DistanceField(self.adjacency(), source)
+            self._distance_fields[source] = field
+            while len(self._distance_fields) > self.distance_cache_size:
+                self._distance_fields.popitem(last=False)     # Evict the least recently used field
+        else:
+            self._distance_fields.move_to_end(source)
+        return field
+
+    def distance(self, coor, source=None):
+        """Returns the number of steps between a cell and a source cell, or -1 if there is no route.
+
+        Args:
+            coor (tuple): The (row, col) of the cell
+            source (tuple): The (row, col) of the source cell. Defaults to the exit of the maze
+        """
+        return self.get_distance_field(source).distance(coor)
+
+    def path_to_source(self, coor, source=None):
+        """Returns a shortest route from a cell to a source cell as a list of (row, col).
+
+        Args:
+            coor (tuple): The (row, col) of the first cell of the route
+            source (tuple): The (row, col) of the source cell. Defaults to the exit of the maze
+        """
+        return self.get_distance_field(source).path_to_source(coor)
+
+    def set_wall_bits(self, walls, row=0, col=0):
+        """Overwrites the walls of a block of cells, by default all cells, with an array of
+        wall bitmasks.
+
+        Args:
+            walls: A 2D array with the wall bitmask of every cell in the block, see Cell.wall_bits
+            row (int): The row of the top left cell of the block
+            col (int): The column of the top left cell of the block
+        """
+        walls = np.asarray(walls, dtype=np.uint8)
+        num_rows, num_cols = walls.shape
+        self.invalidate_adjacency()
+        if self.backend != "cells":
+            self.grid.walls[row:row + num_rows, col:col + num_cols] = walls
+            return
+
+        for grid_row, row_bits in zip(self.grid[row:row + num_rows], walls.tolist()):
+            for cell, bits in zip(grid_row[col:col + num_cols], row_bits):
+                cell.wall_bits = bits
+
+    def reset_visited(self):
+        """Marks every cell in the grid as unvisited."""
+        if self.backend != "cells":
+            self.grid.clear_visited()
+        else:
+            for row in self.grid:
+                for cell in row:
+                    cell.visited = False
+
     def find_neighbours(self, cell_row, cell_col):
         """Finds all existing and unvisited neighbours of a cell in the
         grid. Return a list of tuples containing indices for the unvisited neighbours.
@@ -115,7 +574,7 @@ class Maze(object):
         else:
             return None
 
-    def validate_neighbours_solve(self, neighbour_indices, k, l, k_end, l_end, method = "fancy"):
+    def validate_neighbours_solve(self, neighbour_indices, k, l, k_end, l_end, method = "fancy", is_visited=None):
         """Function that validates whether a neighbour is unvisited or not and discards the
         neighbours that are inaccessible due to walls between them and the current cell. The
         function implements two methods for choosing next cell; one is 'brute-force' where one
@@ -129,17 +588,22 @@ class Maze(object):
             k_end
             l_end
             method
+            is_visited: Function taking (row, col) that returns True for visited cells. Solvers pass
+                their own visited state so the maze is not modified. Defaults to Cell.visited
 
         Return:
 
 
         """
+        if is_visited is None:
+            is_visited = lambda row, col: self.grid[row][col].visited
+
         if method == "fancy":
             neigh_list = list()
             min_dist_to_target = 100000
 
             for k_n, l_n in neighbour_indices:
-                if (not self.grid[k_n][l_n].visited
+                if (not is_visited(k_n, l_n)
                         and not self.grid[k][l].is_walls_between(self.grid[k_n][l_n])):
                     dist_to_target = math.sqrt((k_n - k_end) ** 2 + (l_n - l_end) ** 2)
 
@@ -151,7 +615,7 @@ class Maze(object):
                 neigh_list.append(min_neigh)
 
         elif method == "brute-force":
-            neigh_list = [n for n in neighbour_indices if not self.grid[n[0]][n[1]].visited
+            neigh_list = [n for n in neighbour_indices if not is_visited(n[0], n[1])
                           and not self.grid[k][l].is_walls_between(self.grid[n[0]][n[1]])]
 
         if len(neigh_list) > 0:
@@ -159,6 +623,14 @@ class Maze(object):
         else:
             return None
 
+    def _is_on_boundary(self, coor):
+        """Returns True if coor is the (row, col) of a cell on the boundary of the maze"""
+        if len(coor) != 2:
+            return False
+        k, l = coor
+        return (0 <= k < self.num_rows and 0 <= l < self.num_cols
+                and (k in (0, self.num_rows - 1) or l in (0, self.num_cols - 1)))
+
     def _pick_random_entry_exit(self, used_entry_exit=None):
         """Function that picks random coordinates along the maze boundary to represent either
         the entry or exit point of the maze. Makes sure they are not at the same place.
@@ -173,32 +645,66 @@ class Maze(object):
 
         # Try until unused location along boundary is found.
         while rng_entry_exit == used_entry_exit:
-            rng_side = random.randint(0, 3)
+            rng_side = self.rng.randint(0, 3)
 
             if (rng_side == 0):     # Top side
-                rng_entry_exit = (0, random.randint(0, self.num_cols-1))
+                rng_entry_exit = (0, self.rng.randint(0, self.num_cols-1))
 
             elif (rng_side == 2):   # Right side
-                rng_entry_exit = (self.num_rows-1, random.randint(0, self.num_cols-1))
+                rng_entry_exit = (self.num_rows-1, self.rng.randint(0, self.num_cols-1))
 
             elif (rng_side == 1):   # Bottom side
-                rng_entry_exit = (random.randint(0, self.num_rows-1), self.num_cols-1)
+                rng_entry_exit = (self.rng.randint(0, self.num_rows-1), self.num_cols-1)
 
             elif (rng_side == 3):   # Left side
-                rng_entry_exit = (random.randint(0, self.num_rows-1), 0)
+                rng_entry_exit = (self.rng.randint(0, self.num_rows-1), 0)
 
         return rng_entry_exit       # Return entry/exit that is different from exit/entry
 
-    def generate_maze(self, algorithm, start_coor = (0, 0)):
+    def generate_maze(self, algorithm, start_coor = (0, 0), sink=None):
         """This takes the internal grid object and removes walls between cells using the
-        depth-first recursive backtracker algorithm.
+        given generation algorithm.
 
         Args:
+            algorithm (string): The name of the algorithm, one of algorithm.algorithm_list. Any
+                other value, e.g. None, leaves all walls in place
             start_coor: The starting point for the algorithm
+            sink: Optional function called as sink(event, (row, col)) for every step of the
+                generator, see algorithm.py
 
         """
+        self.algorithm = algorithm
+        self._start_coor = tuple(start_coor)
+        path = MazePath.for_maze(self) if self.record_generation_path else None
+        if path is not None:
+            user_sink = sink
+
+            def sink(event, coor):
+                path.append(coor)
+                if user_sink is not None:
+                    user_sink(event, coor)
 
         if algorithm == "dfs_backtrack":
-            depth_first_recursive_backtracker(self, start_coor)
+            depth_first_recursive_backtracker(self, start_coor, sink)
         elif algorithm == "bin_tree":
-            binary_tree(self, start_coor)
+            binary_tree(self, start_coor, sink)
+        elif algorithm == "eller":
+            eller(self, start_coor, sink)
+        elif algorithm == "kruskal":
+            kruskal(self, start_coor, sink)
+        elif algorithm == "wilson":
+            wilson(self, start_coor, sink)
+        elif algorithm == "tiled_backtrack":
+            tiled_backtracker(self, start_coor, sink)
+
+        if path is not None:
+            self.generation_path = path
+        elif algorithm in ("dfs_backtrack", "wilson"):
+            self.replay_generation_path()     # Their steps were not kept
+
+        self.invalidate_adjacency()
+        if self.backend == "mmap":
+            self.grid.flush()
+            if algorithm in algorithm_list:     # Record the algorithm and start that were used
+                with open(self.filename, "r+b") as file:
+                    file.write(self._file_header(LAYOUT_BYTES, 0))
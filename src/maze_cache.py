@@ -0,0 +1,88 @@
+import os
+import hashlib
+from collections import OrderedDict
+from src.maze import Maze
+
+
+class MazeCache(object):
+    """A cache of generated mazes. Generating a maze with an explicit seed always gives the same
+    walls, so a maze is stored once in its compact form (see Maze.to_bytes) under the key
+    (algorithm, num_rows, num_cols, seed, entry_coor, exit_coor) and later requests for the same
+    key are answered without running the generator. Mazes are kept in an in-memory LRU and,
+    if a directory is given, also on disk so they are shared between jobs.
+
+    Attributes:
+        max_size (int): The number of mazes kept in memory
+        directory (string): Where mazes are stored on disk, None to only cache in memory
+        hits (int): Number of requests answered from memory or disk
+        disk_hits (int): Number of the hits that were read from disk
+        misses (int): Number of requests for which the maze was generated
+    """
+
+    def __init__(self, max_size=128, directory=None):
+        self.max_size = max_size
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._mazes = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._mazes)
+
+    def _file_name(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr(key).encode("ascii")).hexdigest() + ".maze")
+
+    def _lookup(self, key):
+        data = self._mazes.get(key)
+        if data is not None:
+            self._mazes.move_to_end(key)
+            return data
+
+        if self.directory is not None and os.path.exists(self._file_name(key)):
+            with open(self._file_name(key), "rb") as file:
+                data = file.read()
+            self.disk_hits += 1
+            self._store(key, data)
+        return data
+
+    def _store(self, key, data):
+        self._mazes[key] = data
+        while len(self._mazes) > self.max_size:
+            self._mazes.popitem(last=False)     # Evict the least recently used maze
+
+    def get_maze(self, num_rows, num_cols, algorithm="dfs_backtrack", seed=None, id=0, backend="cells",
+                 entry_coor=None, exit_coor=None):
+        """Returns the maze Maze(num_rows, num_cols, id, algorithm, backend, seed, entry_coor,
+        exit_coor), from the cache if it was generated before. Without a seed the maze is
+        different every time, so it is generated and not cached.
+
+        Return:
+            Maze: A new maze object. Its generation path is only created again if it is accessed
+        """
+        if seed is None:
+            return Maze(num_rows, num_cols, id, algorithm, backend, seed, entry_coor, exit_coor)
+
+        key = (algorithm, num_rows, num_cols, seed,
+               tuple(entry_coor) if entry_coor is not None else None,
+               tuple(exit_coor) if exit_coor is not None else None)
+        data = self._lookup(key)
+        if data is None:
+            self.misses += 1
+            maze = Maze(num_rows, num_cols, id, algorithm, backend, seed, entry_coor, exit_coor)
+            data = maze.to_bytes()
+            self._store(key, data)
+            if self.directory is not None:
+                temporary_name = self._file_name(key) + ".tmp{}".format(os.getpid())
+                with open(temporary_name, "wb") as file:
+                    file.write(data)
+                os.replace(temporary_name, self._file_name(key))    # Other jobs never see half a file
+            return maze
+
+        self.hits += 1
+        maze = Maze.from_bytes(data, id, backend, seed)
+        maze.algorithm = algorithm
+        maze.replay_generation_path()
+        return maze
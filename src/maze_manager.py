@@ -1,31 +1,155 @@
-from src.maze import Maze
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from src.maze import Maze, derive_seed
 from src.maze_viz import Visualizer
 from src.solver import DepthFirstBacktracker
 from src.solver import BiDirectional
 from src.solver import BreadthFirst
+from src.solver import AStar
+from src.solver import CorridorAStar
+from src.solver import DiskBreadthFirst
+
+
+def _run_solver(maze, method, neighbor_method, quiet_mode):
+    """Solves a maze with the solver named by method and returns the solution path,
+    or None if there is no solver with that name"""
+
+    """DEVNOTE: When adding a new solution method, call it from here.
+        Also update the list of names in the documentation of MazeManager.solve_maze"""
+    if method == "DepthFirstBacktracker":
+        solver = DepthFirstBacktracker(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    elif method == "BiDirectional":
+        solver = BiDirectional(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    elif method == "BreadthFirst":
+        solver = BreadthFirst(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    elif method == "AStar":
+        solver = AStar(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    elif method == "CorridorAStar":
+        solver = CorridorAStar(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    elif method == "DiskBreadthFirst":
+        solver = DiskBreadthFirst(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+    else:
+        return None
+    return solver.solve()
+
+
+def _solve_serialized(job):
+    """Worker function of MazeManager.solve_many. Rebuilds a maze from Maze.to_bytes and solves it.
+
+    Args:
+        job (tuple): (serialized maze, method, neighbor_method)
+
+    Return:
+        The solution path
+    """
+    data, method, neighbor_method = job
+    return _run_solver(Maze.from_bytes(data), method, neighbor_method, True)
+
+
+def _generate_serialized(job):
+    """Worker function of MazeManager.add_mazes. Generates a maze and returns it as Maze.to_bytes.
+
+    Args:
+        job (tuple): (num_rows, num_cols, algorithm, seed)
+    """
+    num_rows, num_cols, algorithm, seed = job
+    maze = Maze(num_rows, num_cols, algorithm=algorithm, backend="packed", seed=seed, quiet_mode=True)
+    return maze.to_bytes()
 
 
 class MazeManager(object):
     """A manager that abstracts the interaction with the library's components. The graphs, animations, maze creation,
     and solutions are all handled through the manager.
 
+    Mazes are kept in a dict indexed by their id, ordered from least to most recently used. With a
+    memory budget, the least recently used mazes are evicted when the mazes use more memory than
+    the budget (see Maze.nbytes). Evicted mazes are dropped, or saved to the spill directory with
+    Maze.save and loaded again when they are requested. Spilled mmap mazes are loaded again with
+    the packed backend, the files they were mapped from are left as they are.
+
     Attributes:
-        mazes (list): It is possible to have more than one maze. They are stored inside this variable.
+        mazes (OrderedDict): The mazes held in memory by their id, least recently used first
         media_name (string): The filename for animations and images
         quiet_mode (bool): When true, information is not shown on the console
+        memory_budget (int): The number of bytes the mazes in memory may use, None for no limit
+        spill_directory (string): Where evicted mazes are stored, None to drop them
     """
 
-    def __init__(self):
-        self.mazes = []
+    def __init__(self, memory_budget=None, spill_directory=None):
+        self.mazes = OrderedDict()
         self.media_name = ""
         self.quiet_mode = False
+        self.memory_budget = memory_budget
+        self.spill_directory = spill_directory
+        self._spilled = dict()      # id -> (file name, backend) of evicted mazes
+        self._sizes = dict()        # id -> Maze.nbytes when the maze was last used
+        self._droppable = OrderedDict()     # ids of the mazes holding a generation path, least recently used first
+        self._memory = 0
+        self._next_id = 0
+        if spill_directory is not None:
+            os.makedirs(spill_directory, exist_ok=True)
+
+    def _allocate_id(self):
+        """Returns an id that no maze in the manager has. Ids are not reused after removal."""
+        while self._next_id in self.mazes or self._next_id in self._spilled:
+            self._next_id += 1
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _register(self, maze):
+        """Adds a maze or marks it as the most recently used one, then enforces the memory budget.
+        Generation paths of the least recently used mazes are dropped first, before any maze is evicted"""
+        if maze.id in self._spilled:    # The maze was evicted while it was still in use
+            os.remove(self._spilled.pop(maze.id)[0])
+        self.mazes[maze.id] = maze
+        self.mazes.move_to_end(maze.id)
+        self._memory -= self._sizes.get(maze.id, 0)
+        self._sizes[maze.id] = maze.nbytes()
+        self._memory += self._sizes[maze.id]
+        if maze._generation_path_builder is None and maze._generation_path:
+            self._droppable[maze.id] = None
+            self._droppable.move_to_end(maze.id)
+        else:
+            self._droppable.pop(maze.id, None)
+
+        if self.memory_budget is None:
+            return
+        while self._memory > self.memory_budget and self._droppable:    # Paths are replayed from the seeds
+            other_id, _ = self._droppable.popitem(last=False)
+            if other_id == maze.id:     # Only the path of the maze in use is left
+                self._droppable[other_id] = None
+                break
+            other = self.mazes[other_id]
+            if other.drop_generation_path():
+                self._memory -= self._sizes[other_id]
+                self._sizes[other_id] = other.nbytes()
+                self._memory += self._sizes[other_id]
+
+        while self._memory > self.memory_budget and len(self.mazes) > 1:
+            evicted_id, evicted = self.mazes.popitem(last=False)
+            self._memory -= self._sizes.pop(evicted_id)
+            self._droppable.pop(evicted_id, None)
+            if self.spill_directory is not None:
+                file_name = os.path.join(self.spill_directory, "maze_{}.bin".format(evicted_id))
+                evicted.save(file_name)
+                # The spilled copy is not the file an mmap maze was mapped from, so it is loaded into memory
+                backend = "packed" if evicted.backend == "mmap" else evicted.backend
+                self._spilled[evicted_id] = (file_name, backend)
+
+    def _load_spilled(self, id):
+        """Loads an evicted maze from the spill directory back into memory"""
+        file_name, backend = self._spilled[id]
+        maze = Maze.load(file_name, id, backend)
+        del self._spilled[id]
+        os.remove(file_name)
+        self._register(maze)
+        return maze
 
     def add_maze(self, row, col, id=0):
-        """Add a maze to the manager. We give the maze an index of
-        the total number of mazes in the manager. As long as we don't
-        add functionality to delete mazes from the manager, the ids will
-        always be unique. Note that the id will always be greater than 0 because
-        we add 1 to the length of self.mazes, which is set after the id assignment
+        """Add a maze to the manager. Without an id, or if the id is already taken,
+        the maze is given a new unique id.
 
         Args:
             row (int): The height of the maze
@@ -36,15 +160,46 @@ class MazeManager(object):
             Maze: The newly created maze
         """
 
-        if id is not 0:
-            self.mazes.append(Maze(row, col, id))
-        else:
-            if len(self.mazes) < 1:
-                self.mazes.append(Maze(row, col, 0))
-            else:
-                self.mazes.append(Maze(row, col, len(self.mazes) + 1))
+        if id == 0 or id in self.mazes or id in self._spilled:
+            id = self._allocate_id()
+        maze = Maze(row, col, id)
+        self._register(maze)
+        return maze
 
-        return self.mazes[-1]
+    def add_mazes(self, count, row, col, algorithm="dfs_backtrack", seed=None, backend="cells",
+                  max_workers=None, chunksize=16):
+        """Generates many mazes in parallel in a pool of processes and adds them to the manager.
+        Maze number i of the batch is generated from the seed derive_seed(seed, i), so the mazes
+        are the same for any number of processes, and any one of them can be generated again
+        with Maze(row, col, algorithm=algorithm, seed=derive_seed(seed, i)).
+
+        Args:
+            count (int): The number of mazes
+            row (int): The height of the mazes
+            col (int): The width of the mazes
+            algorithm (string): The name of the generation algorithm
+            seed (int): The seed of the batch. Drawn from the random module if not given
+            backend (string): The grid backend of the mazes, see Maze
+            max_workers (int): The number of processes, defaults to the number of CPUs
+            chunksize (int): The number of mazes generated by a worker at a time
+
+        Returns
+            list: The newly created mazes, in batch order
+        """
+        if seed is None:
+            seed = random.getrandbits(64)
+        seeds = [derive_seed(seed, i) for i in range(count)]
+
+        mazes = list()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            jobs = [(row, col, algorithm, maze_seed) for maze_seed in seeds]
+            for maze_seed, data in zip(seeds, executor.map(_generate_serialized, jobs, chunksize=chunksize)):
+                maze = Maze.from_bytes(data, self._allocate_id(), backend, maze_seed)
+                maze.algorithm = algorithm
+                maze.replay_generation_path()
+                self._register(maze)
+                mazes.append(maze)
+        return mazes
 
     def add_existing_maze(self, maze, override=True):
         """Add an already existing maze to the manager.
@@ -57,22 +212,38 @@ class MazeManager(object):
             override (bool): A flag that you can set to bypass checking the id
 
         Returns:
-            True: If the maze was added to the manager
+            Maze: If the maze was added to the manager
             False: If the maze could not be added to the manager
         """
 
-        # Check if there is a maze with the same id. If there is a conflict, return False
-        if self.check_matching_id(maze.id) is None:
-            if override:
-                if len(self.mazes) < 1:
-                    maze.id = 0
-                else:
-                    maze.id = self.mazes.__len__()+1
-        else:
-            return False
-        self.mazes.append(maze)
+        if override:
+            maze.id = self._allocate_id()
+        elif maze.id in self.mazes or maze.id in self._spilled:
+            return False    # There is a maze with the same id
+        self._register(maze)
         return maze
 
+    def remove_maze(self, id):
+        """Removes a maze from the manager.
+
+        Args:
+            id (int): The id of the maze
+
+        Return:
+            True: If the maze was removed
+            False: If there is no maze with that id
+        """
+        if id in self._spilled:
+            os.remove(self._spilled.pop(id)[0])
+            return True
+        if id not in self.mazes:
+            return False
+
+        del self.mazes[id]
+        self._memory -= self._sizes.pop(id)
+        self._droppable.pop(id, None)
+        return True
+
     def get_maze(self, id):
         """Get a maze by its id.
 
@@ -84,26 +255,32 @@ class MazeManager(object):
                     None: If no maze was found
         """
 
-        for maze in self.mazes:
-            if maze.id == id:
-                return maze
-        print("Unable to locate maze")
-        return None
+        maze = self.check_matching_id(id)
+        if maze is None:
+            print("Unable to locate maze")
+        return maze
 
     def get_mazes(self):
-        """Get all of the mazes that the manager is holding"""
-        return self.mazes
+        """Get all of the mazes that the manager is holding in memory, least recently used first"""
+        return list(self.mazes.values())
 
     def get_maze_count(self):
-        """Gets the number of mazes that the manager is holding"""
-        return self.mazes.__len__()
+        """Gets the number of mazes that the manager is holding, including evicted mazes on disk"""
+        return len(self.mazes) + len(self._spilled)
+
+    def get_memory_usage(self):
+        """Gets the estimated number of bytes used by the mazes held in memory"""
+        return self._memory
 
     def solve_maze(self, maze_id, method, neighbor_method="fancy"):
         """ Called to solve a maze by a particular method. The method
         is specified by a string. The options are
             1. DepthFirstBacktracker
-            2.
-            3.
+            2. BiDirectional
+            3. BreadthFirst
+            4. AStar
+            5. CorridorAStar
+            6. DiskBreadthFirst
         Args:
             maze_id (int): The id of the maze that will be solved
             method (string): The name of the method (see above)
@@ -115,23 +292,95 @@ class MazeManager(object):
             print("Unable to locate maze. Exiting solver.")
             return None
 
-        """DEVNOTE: When adding a new solution method, call it from here.
-            Also update the list of names in the documentation above"""
-        if method == "DepthFirstBacktracker":
-            solver = DepthFirstBacktracker(maze, neighbor_method, self.quiet_mode)
-            maze.solution_path = solver.solve()
-        elif method == "BiDirectional":
-            solver = BiDirectional(maze, neighbor_method, self.quiet_mode)
-            maze.solution_path = solver.solve()
-        elif method == "BreadthFirst":
-            solver = BreadthFirst(maze, neighbor_method, self.quiet_mode)
-            maze.solution_path = solver.solve()
+        solution_path = _run_solver(maze, method, neighbor_method, self.quiet_mode)
+        if solution_path is not None:
+            maze.solution_path = solution_path
+            self._register(maze)
+
+    def solve_many(self, jobs, neighbor_method="fancy", max_workers=None, chunksize=16):
+        """Solves many mazes in parallel in a pool of processes. The mazes are sent to the workers
+        in the compact form of Maze.to_bytes, and the solution path of every job is written back
+        onto its maze, as with solve_maze.
+
+        Args:
+            jobs: Iterable of (maze_id, method) pairs, see solve_maze for the methods
+            neighbor_method:
+            max_workers (int): The number of processes, defaults to the number of CPUs
+            chunksize (int): The number of jobs sent to a worker at a time
+
+        Return:
+            int: The number of mazes that were solved
+        """
+        ids, payloads = list(), dict()
+        for maze_id, method in jobs:
+            if maze_id not in payloads:
+                maze = self.get_maze(maze_id)
+                if maze is None:
+                    print("Unable to locate maze {}. Skipping it.".format(maze_id))
+                    continue
+                payloads[maze_id] = maze.to_bytes()     # Serialize every maze only once
+            ids.append((maze_id, (payloads[maze_id], method, neighbor_method)))
+
+        if not ids:
+            return 0
+
+        solved = 0
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_solve_serialized, [job for _, job in ids], chunksize=chunksize)
+            for (maze_id, _), solution_path in zip(ids, results):
+                maze = self.check_matching_id(maze_id)
+                if solution_path is not None and maze is not None:
+                    maze.solution_path = solution_path
+                    self._register(maze)
+                    solved += 1
+        return solved
+
+    def solve_all(self, method, neighbor_method="fancy", max_workers=None, chunksize=16):
+        """Solves every maze held by the manager in parallel, see solve_many.
+
+        Args:
+            method (string): The name of the method, see solve_maze
+            neighbor_method:
+            max_workers (int): The number of processes, defaults to the number of CPUs
+            chunksize (int): The number of jobs sent to a worker at a time
+
+        Return:
+            int: The number of mazes that were solved
+        """
+        return self.solve_many([(id, method) for id in list(self.mazes) + list(self._spilled)], neighbor_method,
+                               max_workers, chunksize)
 
     def show_maze(self, id, cell_size=1):
         """Just show the generation animation and maze"""
         vis = Visualizer(self.get_maze(id), cell_size, self.media_name)
         vis.show_maze()
 
+    def show_maze_image(self, id, cell_pixels=8, wall_pixels=1, solution=False):
+        """Shows the maze as a single raster image, which is much faster than show_maze for large mazes"""
+        vis = Visualizer(self.get_maze(id), 1, self.media_name)
+        vis.show_maze_image(cell_pixels, wall_pixels, solution)
+
+    def save_maze_images(self, filename_pattern, cell_pixels=4, wall_pixels=1, solution=False):
+        """Saves every maze as a raster image, e.g. thumbnails of a batch of mazes.
+
+        Args:
+            filename_pattern (string): The name of the image files, formatted with the id of the maze,
+                e.g. "thumbnails/maze_{}.png"
+            cell_pixels (int): The distance between two walls in pixels
+            wall_pixels (int): The thickness of the walls in pixels
+            solution (bool): Whether to fill the cells of the solution paths
+
+        Return:
+            list: The names of the saved files
+        """
+        filenames = list()
+        for id in list(self.mazes) + list(self._spilled):
+            maze = self.check_matching_id(id)
+            filename = filename_pattern.format(id)
+            Visualizer(maze, 1, None).save_maze_image(filename, cell_pixels, wall_pixels, solution)
+            filenames.append(filename)
+        return filenames
+
     def show_generation_animation(self, id, cell_size=1):
         vis = Visualizer(self.get_maze(id), cell_size, self.media_name)
         vis.show_generation_animation()
@@ -158,9 +407,15 @@ class MazeManager(object):
             id (int): The id to be checked
 
         Returns:
-
+            Maze: The maze with that id, loaded from the spill directory if it was evicted
+            None: If no maze has that id
         """
-        return next((maze for maze in self.mazes if maze .id == id), None)
+        maze = self.mazes.get(id)
+        if maze is not None:
+            self._register(maze)
+        elif id in self._spilled:
+            maze = self._load_spilled(id)
+        return maze
 
     def set_filename(self, filename):
         """
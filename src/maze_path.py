@@ -0,0 +1,124 @@
+from array import array
+
+
+class MazePath(object):
+    """Compact storage for a path through a maze. Instead of a list of tuples, every step is
+    stored as one unsigned 32 bit integer holding the flat index of the cell (row*num_cols + col).
+    With backtracked flags, as in a solution path, the flag is packed into the lowest bit, so a
+    step is stored as flat_index << 1 | backtracked. Mazes of 2**31 cells or more need wide paths,
+    which use 64 bit integers, see for_maze. Indexing and iterating returns the steps in the shape
+    of the list they replace, (row, col) or ((row, col), backtracked), so code written for lists
+    of tuples keeps working. A path compares equal to a list with the same steps.
+
+    Attributes:
+        num_cols (int): The width of the maze, used to convert between flat indices and (row, col)
+        flags (bool): Whether every step carries a backtracked flag
+        values (array): The packed steps
+    """
+
+    def __init__(self, num_cols, flags=False, values=None, wide=False):
+        """Creates an empty path, or a path over already packed steps.
+
+        Args:
+            num_cols (int): The width of the maze
+            flags (bool): Whether the steps are ((row, col), backtracked) instead of (row, col)
+            values: Packed steps, e.g. the bytes of a uint32 (uint64 if wide) array. An array of
+                the right type is used as it is, anything else is copied
+            wide (bool): Whether the steps are stored as 64 bit instead of 32 bit integers
+        """
+        self.num_cols = num_cols
+        self.flags = flags
+        typecode = "Q" if wide else "I"
+        if isinstance(values, array) and values.typecode == typecode:
+            self.values = values
+        elif isinstance(values, (bytes, bytearray, memoryview)):
+            self.values = array(typecode)
+            self.values.frombytes(values)
+        else:
+            self.values = array(typecode, values if values is not None else ())
+
+    @classmethod
+    def for_maze(cls, maze, flags=False):
+        """Creates an empty path for a maze, wide if the steps of the maze do not fit 32 bits"""
+        return cls(maze.num_cols, flags, wide=maze.num_rows*maze.num_cols >= 2**31)
+
+    @classmethod
+    def from_steps(cls, steps, num_cols, flags=False, wide=False):
+        """Creates a path holding the steps of a list of (row, col) or ((row, col), backtracked)"""
+        path = cls(num_cols, flags, wide=wide)
+        path.extend(steps)
+        return path
+
+    def is_wide(self):
+        """Returns True if the steps are stored as 64 bit integers"""
+        return self.values.typecode == "Q"
+
+    def _pack(self, step):
+        if self.flags:
+            (row, col), backtracked = step
+            return (row*self.num_cols + col) << 1 | bool(backtracked)
+        row, col = step
+        return row*self.num_cols + col
+
+    def _unpack(self, value):
+        if self.flags:
+            return divmod(value >> 1, self.num_cols), bool(value & 1)
+        return divmod(value, self.num_cols)
+
+    def append(self, step):
+        """Adds a step in the shape of the path, (row, col) or ((row, col), backtracked)"""
+        self.values.append(self._pack(step))
+
+    def append_cell(self, cell, backtracked=False):
+        """Adds a step by the flat index of its cell, without creating any tuples"""
+        self.values.append(cell << 1 | backtracked if self.flags else cell)
+
+    def extend(self, steps):
+        """Adds the steps of an iterable of (row, col) or ((row, col), backtracked)"""
+        self.values.extend(self._pack(step) for step in steps)
+
+    def cells(self):
+        """Returns the flat indices of the cells of all steps as an array"""
+        if not self.flags:
+            return array(self.values.typecode, self.values)
+        return array(self.values.typecode, (value >> 1 for value in self.values))
+
+    def nbytes(self):
+        """Returns the number of bytes used by the packed steps"""
+        return self.values.itemsize*len(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MazePath(self.num_cols, self.flags, self.values[index], self.is_wide())
+        return self._unpack(self.values[index])
+
+    def __iter__(self):
+        unpack = self._unpack
+        for value in self.values:
+            yield unpack(value)
+
+    def __reversed__(self):
+        unpack = self._unpack
+        for value in reversed(self.values):
+            yield unpack(value)
+
+    def __eq__(self, other):
+        if isinstance(other, MazePath):
+            if self.num_cols == other.num_cols and self.flags == other.flags:
+                return self.values == other.values
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "MazePath({})".format(list(self))
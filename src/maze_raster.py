@@ -0,0 +1,74 @@
+import numpy as np
+from src.cell import WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+
+WALL_COLOR = (0, 0, 0)
+BACKGROUND_COLOR = (255, 255, 255)
+ENTRY_COLOR = (60, 180, 75)
+EXIT_COLOR = (230, 25, 75)
+PATH_COLOR = (120, 200, 120)
+BACKTRACK_COLOR = (255, 165, 0)
+
+
+def render_maze(walls, cell_pixels=8, wall_pixels=1, entry_coor=None, exit_coor=None, solution_path=None):
+    """Draws a maze as an RGB image. Instead of one line per wall, the image is built from a
+    lookup table of the pixels of every possible wall bitmask, which is indexed with the walls of
+    all cells at once. Every cell draws its top and left walls, the bottom walls of the last row and
+    the right walls of the last column are added along the edges of the image.
+
+    Args:
+        walls: A (num_rows, num_cols) array of wall bitmasks, see Maze.get_wall_bits
+        cell_pixels (int): The distance between two walls in pixels, including one wall
+        wall_pixels (int): The thickness of the walls in pixels, less than cell_pixels
+        entry_coor (tuple): The (row, col) of the entry cell, filled with ENTRY_COLOR if given
+        exit_coor (tuple): The (row, col) of the exit cell, filled with EXIT_COLOR if given
+        solution_path: The ((row, col), backtracked) steps of a solver. The cells are filled with
+            PATH_COLOR, or BACKTRACK_COLOR for cells the solver backtracked from
+
+    Return:
+        numpy.ndarray: A (num_rows*cell_pixels + wall_pixels, num_cols*cell_pixels + wall_pixels, 3)
+            uint8 image, e.g. for matplotlib's imshow and imsave
+    """
+    if not 0 < wall_pixels < cell_pixels:
+        raise ValueError("The walls must be thinner than the cells")
+    walls = np.asarray(walls, dtype=np.uint8)
+    num_rows, num_cols = walls.shape
+    height, width = num_rows*cell_pixels + wall_pixels, num_cols*cell_pixels + wall_pixels
+
+    # Pixels of one cell for every wall bitmask, with the post at the top left corner always set
+    tiles = np.zeros((16, cell_pixels, cell_pixels), dtype=bool)
+    tiles[:, :wall_pixels, :wall_pixels] = True
+    for bits in range(16):
+        if bits & WALL_TOP:
+            tiles[bits, :wall_pixels, :] = True
+        if bits & WALL_LEFT:
+            tiles[bits, :, :wall_pixels] = True
+
+    is_wall = np.ones((height, width), dtype=bool)
+    is_wall[:-wall_pixels, :-wall_pixels] = (tiles[walls & 15].transpose(0, 2, 1, 3)
+                                             .reshape(num_rows*cell_pixels, num_cols*cell_pixels))
+    # The bottom and right edges are walls except where the last row or column is open
+    is_post = np.arange(max(num_rows, num_cols)*cell_pixels) % cell_pixels < wall_pixels
+    bottom = np.repeat((walls[-1] & WALL_BOTTOM) != 0, cell_pixels) | is_post[:num_cols*cell_pixels]
+    is_wall[-wall_pixels:, :-wall_pixels] = bottom
+    right = np.repeat((walls[:, -1] & WALL_RIGHT) != 0, cell_pixels) | is_post[:num_rows*cell_pixels]
+    is_wall[:-wall_pixels, -wall_pixels:] = right[:, np.newaxis]
+
+    colors = np.array([BACKGROUND_COLOR, WALL_COLOR, PATH_COLOR, BACKTRACK_COLOR, ENTRY_COLOR, EXIT_COLOR],
+                      dtype=np.uint8)
+    fill = np.zeros((num_rows, num_cols), dtype=np.uint8)     # Index into colors of every cell
+    if solution_path is not None:
+        backtracked = dict()
+        for coor, was_backtracked in solution_path:
+            backtracked[coor] = backtracked.get(coor, False) or bool(was_backtracked)
+        if backtracked:
+            rows, cols = np.array(list(backtracked), dtype=np.intp).reshape(-1, 2).T
+            fill[rows, cols] = np.where(list(backtracked.values()), 3, 2)
+    if entry_coor is not None:
+        fill[tuple(entry_coor)] = 4
+    if exit_coor is not None:
+        fill[tuple(exit_coor)] = 5
+
+    index = np.repeat(np.repeat(fill, cell_pixels, axis=0), cell_pixels, axis=1)
+    index = np.pad(index, ((0, wall_pixels), (0, wall_pixels)), mode="constant")
+    index[is_wall] = 1
+    return colors[index]
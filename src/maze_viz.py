@@ -1,10 +1,52 @@
 import matplotlib.pyplot as plt
 from matplotlib import animation
+from matplotlib.collections import LineCollection
 import logging
+import numpy as np
+from src.cell import RIGHT, BOTTOM, OPPOSITE, WALL_TOP, WALL_RIGHT, WALL_BOTTOM, WALL_LEFT
+from src.maze_raster import render_maze
 
 logging.basicConfig(level=logging.DEBUG)
 
 
+def wall_segments(walls, cell_size=1):
+    """Returns the walls of a maze as line segments, where walls that continue each other along a
+    row or column are merged into one segment. A maze has far fewer of these runs than walls, so
+    drawing them as one LineCollection is much faster than plotting every wall.
+
+    Args:
+        walls: A (num_rows, num_cols) array of wall bitmasks, see Maze.get_wall_bits
+        cell_size (int): The length of a wall in the plot
+
+    Return:
+        numpy.ndarray: A (num_segments, 2, 2) array of segments as ((x0, y0), (x1, y1)), where x
+            runs along the columns and y along the rows
+    """
+    walls = np.asarray(walls, dtype=np.uint8)
+    num_rows, num_cols = walls.shape
+
+    # horizontal[i, j] is set if there is a wall above cell (i, j), row num_rows being the bottom border
+    horizontal = np.zeros((num_rows + 1, num_cols), dtype=bool)
+    horizontal[:-1] |= (walls & WALL_TOP) != 0
+    horizontal[1:] |= (walls & WALL_BOTTOM) != 0
+    # vertical[j, i] is set if there is a wall left of cell (i, j), column num_cols being the right border
+    vertical = np.zeros((num_cols + 1, num_rows), dtype=bool)
+    vertical[:-1] |= (walls & WALL_LEFT).T != 0
+    vertical[1:] |= (walls & WALL_RIGHT).T != 0
+
+    segments = list()
+    for lines, is_horizontal in ((horizontal, True), (vertical, False)):
+        # A run starts where a wall follows no wall and ends where no wall follows a wall
+        edges = np.diff(np.pad(lines, ((0, 0), (1, 1)), mode="constant").astype(np.int8), axis=1)
+        line, start = np.nonzero(edges == 1)
+        end = np.nonzero(edges == -1)[1]
+        if is_horizontal:
+            segments.append(np.stack([np.stack([start, line], axis=1), np.stack([end, line], axis=1)], axis=1))
+        else:
+            segments.append(np.stack([np.stack([line, start], axis=1), np.stack([line, end], axis=1)], axis=1))
+    return np.concatenate(segments)*cell_size
+
+
 class Visualizer(object):
     """Class that handles all aspects of visualization.
 
@@ -53,26 +95,59 @@ class Visualizer(object):
         if self.media_filename:
             fig.savefig("{}{}.png".format(self.media_filename, "_generation"), frameon=None)
 
-    def plot_walls(self):
-        """ Plots the walls of a maze. This is used when generating the maze image"""
-        for i in range(self.maze.num_rows):
-            for j in range(self.maze.num_cols):
-                if self.maze.initial_grid[i][j].is_entry_exit == "entry":
-                    self.ax.text(j*self.cell_size, i*self.cell_size, "START", fontsize=7, weight="bold")
-                elif self.maze.initial_grid[i][j].is_entry_exit == "exit":
-                    self.ax.text(j*self.cell_size, i*self.cell_size, "END", fontsize=7, weight="bold")
-                if self.maze.initial_grid[i][j].walls["top"]:
-                    self.ax.plot([j*self.cell_size, (j+1)*self.cell_size],
-                                 [i*self.cell_size, i*self.cell_size], color="k")
-                if self.maze.initial_grid[i][j].walls["right"]:
-                    self.ax.plot([(j+1)*self.cell_size, (j+1)*self.cell_size],
-                                 [i*self.cell_size, (i+1)*self.cell_size], color="k")
-                if self.maze.initial_grid[i][j].walls["bottom"]:
-                    self.ax.plot([(j+1)*self.cell_size, j*self.cell_size],
-                                 [(i+1)*self.cell_size, (i+1)*self.cell_size], color="k")
-                if self.maze.initial_grid[i][j].walls["left"]:
-                    self.ax.plot([j*self.cell_size, j*self.cell_size],
-                                 [(i+1)*self.cell_size, i*self.cell_size], color="k")
+    def render_image(self, cell_pixels=8, wall_pixels=1, solution=False):
+        """Draws the maze as an RGB image, see maze_raster.render_maze. Unlike plot_walls this
+        creates no matplotlib artists, so it is fast enough for large mazes.
+
+            Args:
+                cell_pixels (int): The distance between two walls in pixels
+                wall_pixels (int): The thickness of the walls in pixels
+                solution (bool): Whether to fill the cells of the solution path
+
+            Return:
+                numpy.ndarray: The (height, width, 3) uint8 image
+        """
+        return render_maze(self.maze.get_wall_bits(), cell_pixels, wall_pixels,
+                           self.maze.entry_coor, self.maze.exit_coor,
+                           self.maze.solution_path if solution else None)
+
+    def show_maze_image(self, cell_pixels=8, wall_pixels=1, solution=False):
+        """Displays the maze as a single image, see render_image"""
+        image = self.render_image(cell_pixels, wall_pixels, solution)
+
+        fig = plt.figure(figsize=(7, 7*self.maze.num_rows/self.maze.num_cols))
+        self.ax = plt.axes()
+        self.ax.axes.get_xaxis().set_visible(False)
+        self.ax.axes.get_yaxis().set_visible(False)
+        self.ax.imshow(image, interpolation="nearest")
+        plt.show()
+
+        if self.media_filename:
+            plt.imsave("{}{}.png".format(self.media_filename, "_solution" if solution else "_generation"), image)
+
+    def save_maze_image(self, filename, cell_pixels=8, wall_pixels=1, solution=False):
+        """Saves the maze as an image file without creating a figure, e.g. for thumbnails of many mazes
+
+            Args:
+                filename (string): The name of the image file, its extension selects the format
+                cell_pixels (int): The distance between two walls in pixels
+                wall_pixels (int): The thickness of the walls in pixels
+                solution (bool): Whether to fill the cells of the solution path
+        """
+        plt.imsave(filename, self.render_image(cell_pixels, wall_pixels, solution))
+
+    def plot_walls(self, linewidth=None):
+        """ Plots the walls of a maze as a single LineCollection of merged wall runs, see
+        wall_segments. This is used when generating the maze image"""
+        self.add_entry_exit_text()
+        self.ax.add_collection(LineCollection(wall_segments(self.maze.get_wall_bits(), self.cell_size),
+                                              colors="k", linewidths=linewidth))
+        self.ax.autoscale_view()
+
+    def add_entry_exit_text(self):
+        """Labels the entry and exit cells of the maze"""
+        for (i, j), label in ((self.maze.entry_coor, "START"), (self.maze.exit_coor, "END")):
+            self.ax.text(j*self.cell_size, i*self.cell_size, label, fontsize=7, weight="bold")
 
     def configure_plot(self):
         """Sets the initial properties of the maze plot. Also creates the plot and axes"""
@@ -105,23 +180,20 @@ class Visualizer(object):
         # Plot the walls onto the figure
         self.plot_walls()
 
-        list_of_backtrackers = [path_element[0] for path_element in self.maze.solution_path if path_element[1]]
+        backtracked_cells = set(path_element[0] for path_element in self.maze.solution_path if path_element[1])
 
         # Keeps track of how many circles have been drawn
         circle_num = 0
-
-        self.ax.add_patch(plt.Circle(((self.maze.solution_path[0][0][1] + 0.5)*self.cell_size,
-                                      (self.maze.solution_path[0][0][0] + 0.5)*self.cell_size), 0.2*self.cell_size,
-                                     fc=(0, circle_num/(len(self.maze.solution_path) - 2*len(list_of_backtrackers)),
-                                         0), alpha=0.4))
-
-        for i in range(1, self.maze.solution_path.__len__()):
-            if self.maze.solution_path[i][0] not in list_of_backtrackers and\
-                    self.maze.solution_path[i-1][0] not in list_of_backtrackers:
+        num_circles = len(set(path_element[0] for path_element in self.maze.solution_path)) - len(backtracked_cells)
+
+        # Draw one circle on every cell of the solution, i.e. every cell the solver did not backtrack from
+        circled = set()
+        for cell, _ in self.maze.solution_path:
+            if cell not in backtracked_cells and cell not in circled:
+                circled.add(cell)
+                self.ax.add_patch(plt.Circle(((cell[1] + 0.5)*self.cell_size, (cell[0] + 0.5)*self.cell_size),
+                    0.2*self.cell_size, fc = (0, circle_num/num_circles, 0), alpha = 0.4))
                 circle_num += 1
-                self.ax.add_patch(plt.Circle(((self.maze.solution_path[i][0][1] + 0.5)*self.cell_size,
-                    (self.maze.solution_path[i][0][0] + 0.5)*self.cell_size), 0.2*self.cell_size,
-                    fc = (0, circle_num/(len(self.maze.solution_path) - 2*len(list_of_backtrackers)), 0), alpha = 0.4))
 
         # Display the plot to the user
         plt.show()
@@ -131,15 +203,15 @@ class Visualizer(object):
             fig.savefig("{}{}.png".format(self.media_filename, "_solution"), frameon=None)
 
     def show_generation_animation(self):
-        """Function that animates the process of generating the a maze where path is a list
-        of coordinates indicating the path taken to carve out (break down walls) the maze."""
+        """Function that animates the process of generating the a maze. The steps taken to carve
+        out (break down walls) the maze are streamed from Maze.generation_steps, so the generation
+        path is not kept in memory."""
 
         # Create the figure and style the axes
         fig = self.configure_plot()
 
         # The square that represents the head of the algorithm
-        indicator = plt.Rectangle((self.maze.generation_path[0][0]*self.cell_size, self.maze.generation_path[0][1]*self.cell_size),
-            self.cell_size, self.cell_size, fc = "purple", alpha = 0.6)
+        indicator = plt.Rectangle((0, 0), self.cell_size, self.cell_size, fc = "purple", alpha = 0.6)
 
         self.ax.add_patch(indicator)
 
@@ -166,52 +238,54 @@ class Visualizer(object):
         self.ax.plot([self.width, 0], [0, 0], linewidth = 2, color = color_boundary)
         self.ax.plot([0, 0], [0, self.height], linewidth = 2, color = color_boundary)
 
+        previous = list()       # The cell of the previous step and the number of steps so far
+
         def animate(frame):
             """Function to supervise animation of all objects."""
-            animate_walls(frame)
-            animate_squares(frame)
-            animate_indicator(frame)
-            self.ax.set_title("Step: {}".format(frame + 1), fontname="serif", fontsize=19)
+            _, coor = frame
+            animate_walls(coor)
+            animate_squares(coor)
+            animate_indicator(coor)
+            step = previous[1] + 1 if previous else 1
+            previous[:] = [coor, step]
+            self.ax.set_title("Step: {}".format(step), fontname="serif", fontsize=19)
             return []
 
-        def animate_walls(frame):
+        def animate_walls(coor):
             """Function that animates the visibility of the walls between cells."""
-            if frame > 0:
-                self.maze.grid[self.maze.generation_path[frame-1][0]][self.maze.generation_path[frame-1][1]].remove_walls(
-                    self.maze.generation_path[frame][0],
-                    self.maze.generation_path[frame][1])   # Wall between curr and neigh
-
-                self.maze.grid[self.maze.generation_path[frame][0]][self.maze.generation_path[frame][1]].remove_walls(
-                    self.maze.generation_path[frame-1][0],
-                    self.maze.generation_path[frame-1][1])   # Wall between neigh and curr
-
-                current_cell = self.maze.grid[self.maze.generation_path[frame-1][0]][self.maze.generation_path[frame-1][1]]
-                next_cell = self.maze.grid[self.maze.generation_path[frame][0]][self.maze.generation_path[frame][1]]
-
-                """Function to animate walls between cells as the search goes on."""
-                for wall_key in ["right", "bottom"]:    # Only need to draw two of the four walls (overlap)
-                    if current_cell.walls[wall_key] is False:
-                        self.lines["{},{}: {}".format(current_cell.row,
-                            current_cell.col, wall_key)].set_visible(False)
-                    if next_cell.walls[wall_key] is False:
-                        self.lines["{},{}: {}".format(next_cell.row,
-                                                 next_cell.col, wall_key)].set_visible(False)
-
-        def animate_squares(frame):
+            if previous:
+                current_cell = self.maze.grid[previous[0][0]][previous[0][1]]
+                next_cell = self.maze.grid[coor[0]][coor[1]]
+
+                # Consecutive steps are not always neighbours (e.g. when Wilson's algorithm starts a new
+                # random walk), so only the wall between two neighbours that was carved away is hidden.
+                direction = current_cell.direction_to(next_cell.row, next_cell.col)
+                if direction is None or current_cell.is_walls_between(next_cell):
+                    return
+
+                # Only the right and bottom walls of each cell are drawn (overlap)
+                if direction == RIGHT or direction == BOTTOM:
+                    upper_left_cell = current_cell
+                else:
+                    upper_left_cell, direction = next_cell, OPPOSITE[direction]
+                wall_key = "right" if direction == RIGHT else "bottom"
+                self.lines["{},{}: {}".format(upper_left_cell.row,
+                                              upper_left_cell.col, wall_key)].set_visible(False)
+
+        def animate_squares(coor):
             """Function to animate the searched path of the algorithm."""
-            self.squares["{},{}".format(self.maze.generation_path[frame][0],
-                                   self.maze.generation_path[frame][1])].set_visible(False)
+            self.squares["{},{}".format(coor[0], coor[1])].set_visible(False)
             return []
 
-        def animate_indicator(frame):
+        def animate_indicator(coor):
             """Function to animate where the current search is happening."""
-            indicator.set_xy((self.maze.generation_path[frame][1]*self.cell_size,
-                              self.maze.generation_path[frame][0]*self.cell_size))
+            indicator.set_xy((coor[1]*self.cell_size, coor[0]*self.cell_size))
             return []
 
         logging.debug("Creating generation animation")
-        anim = animation.FuncAnimation(fig, animate, frames=self.maze.generation_path.__len__(),
-                                       interval=100, blit=True, repeat=False)
+        # Every algorithm takes fewer than two steps per cell
+        anim = animation.FuncAnimation(fig, animate, frames=self.maze.generation_steps(),
+                                       save_count=2*self.maze.grid_size, interval=100, blit=True, repeat=False)
 
         logging.debug("Finished creating the generation animation")
 
@@ -227,27 +301,10 @@ class Visualizer(object):
                                            self.maze.num_cols), writer=mpeg_writer)
 
     def add_path(self):
-        # Adding squares to animate the path taken to solve the maze. Also adding entry/exit text
-        color_walls = "k"
+        # Adding squares to animate the path taken to solve the maze. Also adding walls and entry/exit text
+        self.plot_walls(linewidth=2)
         for i in range(self.maze.num_rows):
             for j in range(self.maze.num_cols):
-                if self.maze.initial_grid[i][j].is_entry_exit == "entry":
-                    self.ax.text(j*self.cell_size, i*self.cell_size, "START", fontsize = 7, weight = "bold")
-                elif self.maze.initial_grid[i][j].is_entry_exit == "exit":
-                    self.ax.text(j*self.cell_size, i*self.cell_size, "END", fontsize = 7, weight = "bold")
-
-                if self.maze.initial_grid[i][j].walls["top"]:
-                    self.lines["{},{}: top".format(i, j)] = self.ax.plot([j*self.cell_size, (j+1)*self.cell_size],
-                         [i*self.cell_size, i*self.cell_size], linewidth = 2, color = color_walls)[0]
-                if self.maze.initial_grid[i][j].walls["right"]:
-                    self.lines["{},{}: right".format(i, j)] = self.ax.plot([(j+1)*self.cell_size, (j+1)*self.cell_size],
-                         [i*self.cell_size, (i+1)*self.cell_size], linewidth = 2, color = color_walls)[0]
-                if self.maze.initial_grid[i][j].walls["bottom"]:
-                    self.lines["{},{}: bottom".format(i, j)] = self.ax.plot([(j+1)*self.cell_size, j*self.cell_size],
-                         [(i+1)*self.cell_size, (i+1)*self.cell_size], linewidth = 2, color = color_walls)[0]
-                if self.maze.initial_grid[i][j].walls["left"]:
-                    self.lines["{},{}: left".format(i, j)] = self.ax.plot([j*self.cell_size, j*self.cell_size],
-                             [(i+1)*self.cell_size, i*self.cell_size], linewidth = 2, color = color_walls)[0]
                 self.squares["{},{}".format(i, j)] = plt.Rectangle((j*self.cell_size,
                                                                     i*self.cell_size), self.cell_size, self.cell_size,
                                                                    fc = "red", alpha = 0.4, visible = False)
@@ -0,0 +1,201 @@
+import tempfile
+import numpy as np
+from src.cell import WallMask, ALL_WALLS
+
+
+class PackedGrid(object):
+    """Compact storage engine for the cells of a maze. Instead of one Cell object per
+    position, the walls of every cell are stored as 4 bits in a single byte array and
+    the visited flags are stored in a separate bitmap. Indexing the grid as grid[i][j]
+    returns a lightweight CellView, so code written for a list of lists of Cell objects
+    keeps working.
+
+    Attributes:
+        num_rows (int): The number of rows in the grid
+        num_cols (int): The number of columns in the grid
+        wall_buffer (bytearray): The wall bits of every cell, stored row by row
+        walls (numpy.ndarray): A (num_rows, num_cols) uint8 array sharing memory with wall_buffer
+        visited_bits (bytearray): Bitmap with one visited bit per cell
+        entry_exit (dict): Maps the (row, col) of the entry and exit cells to their label
+    """
+
+    def __init__(self, num_rows, num_cols, walls=None, visited_bits=None):
+        """Creates a grid with all walls up and no visited cells, or a grid over existing storage.
+
+        Args:
+            num_rows (int): The number of rows in the grid
+            num_cols (int): The number of columns in the grid
+            walls: An existing (num_rows, num_cols) uint8 array to keep the walls in, e.g. a numpy.memmap
+            visited_bits: An existing uint8 array with at least one bit per cell to keep the visited flags in
+        """
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        if walls is None:
+            self.wall_buffer = bytearray([ALL_WALLS]) * (num_rows*num_cols)
+            self.walls = np.frombuffer(self.wall_buffer, dtype=np.uint8).reshape(num_rows, num_cols)
+        else:
+            self.walls = walls
+            self.wall_buffer = walls.reshape(-1)
+        self.visited_bits = visited_bits if visited_bits is not None else bytearray((num_rows*num_cols + 7) >> 3)
+        self.entry_exit = dict()
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += self.num_rows
+        if row < 0 or row >= self.num_rows:
+            raise IndexError("grid row index out of range")
+        return PackedRow(self, row)
+
+    def __iter__(self):
+        for row in range(self.num_rows):
+            yield PackedRow(self, row)
+
+    def is_visited(self, row, col):
+        """Returns True if the cell at (row, col) is marked as visited"""
+        index = row*self.num_cols + col
+        return bool(self.visited_bits[index >> 3] & (1 << (index & 7)))
+
+    def set_visited(self, row, col, visited=True):
+        """Sets or clears the visited bit of the cell at (row, col)"""
+        index = row*self.num_cols + col
+        if visited:
+            self.visited_bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.visited_bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def clear_visited(self):
+        """Marks every cell in the grid as unvisited"""
+        if isinstance(self.visited_bits, np.ndarray):
+            self.visited_bits.fill(0)
+        else:
+            self.visited_bits[:] = bytes(len(self.visited_bits))
+
+    def nbytes(self):
+        """Returns the number of bytes used to store the walls and the visited bitmap"""
+        return len(self.wall_buffer) + len(self.visited_bits)
+
+
+class MappedGrid(PackedGrid):
+    """A PackedGrid whose walls live in a file mapped into memory with numpy.memmap, so grids
+    larger than the available memory can be generated and solved. The walls are stored with one
+    byte per cell at an offset in the file, the layout of Maze.save with LAYOUT_BYTES. The visited
+    bitmap is scratch state, it is mapped from an anonymous temporary file that is removed as soon
+    as the grid is no longer used.
+
+    Attributes:
+        filename (string): The file holding the walls
+        readonly (bool): Whether the file is mapped without write access
+    """
+
+    def __init__(self, filename, num_rows, num_cols, offset=0, create=True, readonly=False):
+        """Maps the walls of a grid stored in a file.
+
+        Args:
+            filename (string): The file holding the walls
+            num_rows (int): The number of rows in the grid
+            num_cols (int): The number of columns in the grid
+            offset (int): The position of the walls in the file
+            create (bool): Whether to put up all walls, otherwise the walls in the file are kept
+            readonly (bool): Whether to map the file without write access, e.g. for a file that may
+                not be changed. The walls can then not be changed either
+        """
+        if create and readonly:
+            raise ValueError("A read-only grid can not be created")
+        self.filename = filename
+        self.readonly = readonly
+        walls = np.memmap(filename, dtype=np.uint8, mode="r" if readonly else "r+", offset=offset,
+                          shape=(num_rows, num_cols))
+        self._visited_file = tempfile.TemporaryFile()
+        visited_bits = np.memmap(self._visited_file, dtype=np.uint8, mode="w+",
+                                 shape=((num_rows*num_cols + 7) >> 3,))
+        super().__init__(num_rows, num_cols, walls, visited_bits)
+
+        if create:
+            rows_per_chunk = max(1, (1 << 20) // max(1, num_cols))     # About 1 MB at a time
+            for row in range(0, num_rows, rows_per_chunk):
+                walls[row:row + rows_per_chunk] = ALL_WALLS
+
+    def nbytes(self):
+        """Returns 0, the walls and the visited bitmap are mapped from files and paged in and out by
+        the operating system, so they do not count against the memory of the process"""
+        return 0
+
+    def flush(self):
+        """Writes changes of the walls to the file"""
+        if not self.readonly:
+            self.walls.flush()
+
+
+class PackedRow(object):
+    """A single row of a PackedGrid. Indexing it returns a CellView.
+
+    Attributes:
+        grid (PackedGrid): The grid the row belongs to
+        row (int): The index of the row
+    """
+    __slots__ = ("grid", "row")
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.num_cols
+
+    def __getitem__(self, col):
+        if col < 0:
+            col += self.grid.num_cols
+        if col < 0 or col >= self.grid.num_cols:
+            raise IndexError("grid column index out of range")
+        return CellView(self.grid, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.grid.num_cols):
+            yield CellView(self.grid, self.row, col)
+
+
+class CellView(WallMask):
+    """Lightweight stand-in for a Cell whose state lives inside a PackedGrid. It exposes
+    the same attributes and methods as Cell that are used by the generators, solvers and
+    the visualizer.
+
+    Attributes:
+        grid (PackedGrid): The grid that holds the state of the cell
+        row (int): The row that this cell belongs to
+        col (int): The column that this cell belongs to
+        index (int): The position of the cell in the flat wall buffer
+    """
+    __slots__ = ("grid", "row", "col", "index")
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+        self.index = row*grid.num_cols + col
+
+    @property
+    def wall_bits(self):
+        return int(self.grid.wall_buffer[self.index])
+
+    @wall_bits.setter
+    def wall_bits(self, bits):
+        self.grid.wall_buffer[self.index] = bits & ALL_WALLS
+
+    @property
+    def visited(self):
+        return self.grid.is_visited(self.row, self.col)
+
+    @visited.setter
+    def visited(self, visited):
+        self.grid.set_visited(self.row, self.col, visited)
+
+    @property
+    def is_entry_exit(self):
+        return self.grid.entry_exit.get((self.row, self.col))
+
+    @is_entry_exit.setter
+    def is_entry_exit(self, entry_exit):
+        self.grid.entry_exit[(self.row, self.col)] = entry_exit
@@ -0,0 +1,118 @@
+from array import array
+from collections import deque
+import numpy as np
+
+
+class PathIndex(object):
+    """Index answering route queries between any two cells of a perfect maze. In a perfect maze
+    the passages form a spanning tree, so the route between two cells is unique and goes through
+    their lowest common ancestor (LCA). The tree is rooted once, and binary lifting tables (the
+    2**k-th ancestor of every cell) find the LCA of any two cells in O(log n).
+
+    Attributes:
+        num_cols (int): The width of the maze
+        root (tuple): The (row, col) of the cell the tree is rooted at
+        depth (array): Number of steps between every cell (flat index) and the root
+        ancestors (list): ancestors[k] is an array with the 2**k-th ancestor of every cell. The root
+            is its own ancestor
+    """
+
+    def __init__(self, adjacency, root=(0, 0)):
+        num_cells = adjacency.num_rows*adjacency.num_cols
+        if adjacency.num_edges() != num_cells - 1:
+            raise ValueError("A path index can only be built for a perfect maze")
+
+        self.num_cols = adjacency.num_cols
+        self.root = root
+        offsets, neighbours = adjacency.offsets, adjacency.neighbours
+        start = root[0]*self.num_cols + root[1]
+
+        parent = array("i", [-1]) * num_cells
+        depth = array("i", [0]) * num_cells
+        parent[start] = start
+        queue = deque([start])
+        reached = 1
+        while queue:
+            cell = queue.popleft()
+            for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                if parent[neighbour] < 0:
+                    parent[neighbour] = cell
+                    depth[neighbour] = depth[cell] + 1
+                    queue.append(neighbour)
+                    reached += 1
+        if reached != num_cells:
+            raise ValueError("A path index can only be built for a perfect maze")
+        self.depth = depth
+
+        # The 2**k-th ancestor is the 2**(k-1)-th ancestor of the 2**(k-1)-th ancestor
+        level = np.frombuffer(parent, dtype=np.int32)
+        self.ancestors = [parent]
+        for _ in range(1, max(1, max(depth).bit_length())):
+            level = level[level]
+            self.ancestors.append(array("i", level.tobytes()))
+
+    def _lowest_common_ancestor(self, first, second):
+        depth, ancestors = self.depth, self.ancestors
+        if depth[first] < depth[second]:
+            first, second = second, first
+
+        # Lift the deeper cell to the depth of the other one
+        difference = depth[first] - depth[second]
+        k = 0
+        while difference:
+            if difference & 1:
+                first = ancestors[k][first]
+            difference >>= 1
+            k += 1
+        if first == second:
+            return first
+
+        # Lift both cells as far as possible while staying below the common ancestor
+        for level in reversed(ancestors):
+            if level[first] != level[second]:
+                first, second = level[first], level[second]
+        return ancestors[0][first]
+
+    def lowest_common_ancestor(self, first_coor, second_coor):
+        """Returns the (row, col) of the cell where the routes from both cells to the root join"""
+        first = first_coor[0]*self.num_cols + first_coor[1]
+        second = second_coor[0]*self.num_cols + second_coor[1]
+        return divmod(self._lowest_common_ancestor(first, second), self.num_cols)
+
+    def distance(self, first_coor, second_coor):
+        """Returns the number of steps on the route between two cells in O(log n)
+
+        Args:
+            first_coor (tuple): The (row, col) of the first cell
+            second_coor (tuple): The (row, col) of the second cell
+        """
+        first = first_coor[0]*self.num_cols + first_coor[1]
+        second = second_coor[0]*self.num_cols + second_coor[1]
+        ancestor = self._lowest_common_ancestor(first, second)
+        return self.depth[first] + self.depth[second] - 2*self.depth[ancestor]
+
+    def path(self, first_coor, second_coor):
+        """Returns the route between two cells as a list of (row, col), in O(log n) plus the
+        length of the route
+
+        Args:
+            first_coor (tuple): The (row, col) of the first cell of the route
+            second_coor (tuple): The (row, col) of the last cell of the route
+        """
+        parent = self.ancestors[0]
+        first = first_coor[0]*self.num_cols + first_coor[1]
+        second = second_coor[0]*self.num_cols + second_coor[1]
+        ancestor = self._lowest_common_ancestor(first, second)
+
+        route = list()
+        while first != ancestor:
+            route.append(divmod(first, self.num_cols))
+            first = parent[first]
+        route.append(divmod(ancestor, self.num_cols))
+
+        descent = list()
+        while second != ancestor:
+            descent.append(divmod(second, self.num_cols))
+            second = parent[second]
+        route.extend(reversed(descent))
+        return route
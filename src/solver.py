@@ -1,7 +1,14 @@
 import time
 import random
 import logging
+import tempfile
+import numpy as np
+from array import array
+from collections import deque
+from heapq import heappush, heappop
 from src.maze import Maze
+from src.cell import OPPOSITE
+from src.maze_path import MazePath
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -10,6 +17,9 @@ class Solver(object):
     """Base class for solution methods.
     Every new solution method should override the solve method.
 
+    Solvers never modify the maze. Their visited and parent state lives in buffers owned by the
+    solver, so one maze can be solved repeatedly and by several solvers at the same time.
+
     Attributes:
         maze (list): The maze which is being solved.
         neighbor_method:
@@ -17,13 +27,15 @@ class Solver(object):
 
     """
 
-    def __init__(self, maze, quiet_mode, neighbor_method):
+    def __init__(self, maze, neighbor_method, quiet_mode):
         logging.debug("Class Solver ctor called")
 
         self.maze = maze
         self.neighbor_method = neighbor_method
         self.name = ""
         self.quiet_mode = quiet_mode
+        self.visit_stamps = None    # Cells stamped with the current epoch are visited
+        self.epoch = 0
 
     def solve(self):
         logging.debug('Class: Solver solve called')
@@ -37,14 +49,76 @@ class Solver(object):
         logging.debug('Class Solver get_path called')
         return self.path
 
+    def _new_search(self):
+        """Starts a new search in which no cell is visited. Instead of clearing the visited state,
+        the epoch is increased, so stamps left by earlier searches no longer count as visited.
+
+        Return:
+            (array, int): The visit stamps of all cells (flat index row*num_cols + col) and the epoch
+                that marks a cell as visited in this search
+        """
+        num_cells = self.maze.num_rows*self.maze.num_cols
+        if self.visit_stamps is None or len(self.visit_stamps) != num_cells or self.epoch == 0xFFFFFFFF:
+            self.visit_stamps = array("I", [0]) * num_cells
+            self.epoch = 0
+        self.epoch += 1
+        return self.visit_stamps, self.epoch
+
+    def _route_path(self, parent, goal, expanded=None):
+        """Follows the parent pointers from the goal back to the start to find the route, which is
+        stored as the path of the solver. Returns the search in the solution path format.
+
+        Args:
+            parent: The flat index of the cell every cell was reached from, -1 for the start cell
+            goal (int): The flat index of the exit cell
+            expanded (list): Flat indices of the cells in the order they were searched, or None
+
+        Return:
+            MazePath: The expanded cells, where the cells that are not on the route are marked as
+                backtracked. If expanded is None, only the cells of the route. Empty if the exit
+                was not reached.
+        """
+        num_cols = self.maze.num_cols
+        start = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]
+        if goal != start and parent[goal] == -1:     # The exit was never reached
+            self.path = list()
+            return MazePath.for_maze(self.maze, flags=True)
+
+        on_route = set()
+        route = list()
+        cell = goal
+        while cell != -1:
+            on_route.add(cell)
+            route.append(divmod(cell, num_cols))
+            cell = parent[cell]
+        route.reverse()
+        self.path = route
+
+        path = MazePath.for_maze(self.maze, flags=True)
+        if expanded is None:
+            path.extend((coor, False) for coor in route)
+        else:
+            for cell in expanded:
+                path.append_cell(cell, cell not in on_route)
+        return path
+
 
 class BreadthFirst(Solver):
+    """A solver that implements breadth-first search. Cells are visited in order of their distance
+    from the entry, so the route found is a shortest one. Every cell is queued at most once.
 
-    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy"):
+    Attributes:
+        trace (bool): When True, solve returns every visited cell in the order of the search, with
+            the cells that are not on the route marked like backtracked cells. When False, solve
+            only returns the route.
+    """
+
+    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy", trace=True):
         logging.debug('Class BreadthFirst ctor called')
 
         self.name = "Breadth First Recursive"
-        super().__init__(maze, neighbor_method, quiet_mode)
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+        self.trace = trace
 
     def solve(self):
 
@@ -53,122 +127,130 @@ class BreadthFirst(Solver):
                 moves on to the next level of cells in each branch to continue the search."""
 
         logging.debug("Class BreadthFirst solve called")
-        current_level = [self.maze.entry_coor]  # Stack of cells at current level of search
-        path = list()  # To track path of solution cell coordinates
+        num_rows, num_cols = self.maze.num_rows, self.maze.num_cols
+        graph = self.maze.adjacency()
+        offsets, neighbours = graph.offsets, graph.neighbours
+        start = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]
+        goal = self.maze.exit_coor[0]*num_cols + self.maze.exit_coor[1]
 
-        print("\nSolving the maze with breadth-first search...")
-        time_start = time.clock()
+        parent = array("i", [-1]) * (num_rows*num_cols)     # Cell each cell was reached from
+        parent[start] = start
+        queue = deque([start])      # Cells of the current and the next level of the search
+        expanded = list()           # Visited cells in order
 
-        while True:  # Loop until return statement is encountered
-            next_level = list()
-
-            while current_level:  # While still cells left to search on current level
-                k_curr, l_curr = current_level.pop(0)  # Search one cell on the current level
-                self.maze.grid[k_curr][l_curr].visited = True  # Mark current cell as visited
-                path.append(((k_curr, l_curr), False))  # Append current cell to total search path
+        if not self.quiet_mode:
+            print("\nSolving the maze with breadth-first search...")
+        time_start = time.time()
 
-                if (k_curr, l_curr) == self.maze.exit_coor:  # Exit if current cell is exit cell
-                    if not self.quiet_mode:
-                        print("Number of moves performed: {}".format(len(path)))
-                        print("Execution time for algorithm: {:.4f}".format(time.clock() - time_start))
-                    return path
+        while queue:
+            cell = queue.popleft()
+            expanded.append(cell)
+            if cell == goal:  # Exit if current cell is exit cell
+                break
 
-                neighbour_coors = self.maze.find_neighbours(k_curr, l_curr)  # Find neighbour indicies
-                neighbour_coors = self.maze.validate_neighbours_solve(neighbour_coors, k_curr,
-                                                                  l_curr, self.maze.exit_coor[0],
-                                                                  self.maze.exit_coor[1], self.neighbor_method)
+            for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                if parent[neighbour] < 0:   # Queue every cell only the first time it is reached
+                    parent[neighbour] = cell
+                    queue.append(neighbour)
 
-                if neighbour_coors is not None:
-                    for coor in neighbour_coors:
-                        next_level.append(coor)  # Add all existing real neighbours to next search level
+        parent[start] = -1
+        path = self._route_path(parent, goal, expanded if self.trace else None)
+        if not self.quiet_mode:
+            print("Number of moves performed: {}".format(len(path)))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
 
-            for cell in next_level:
-                current_level.append(cell)  # Update current_level list with cells for nex search level
         logging.debug("Class BreadthFirst leaving solve")
+        return path
 
 
 class BiDirectional(Solver):
+    """A solver that implements a bidirectional breadth-first search, growing one search from the
+    entry and one from the exit until they meet. Every cell is tagged with the search that owns it,
+    so the searches meeting is detected in O(1) per step.
 
-    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy"):
+    Attributes:
+        trace (bool): When True, solve returns every visited cell in the order of the search, with
+            the cells that are not on the route marked like backtracked cells. When False, solve
+            only returns the route.
+    """
+
+    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy", trace=True):
         logging.debug('Class BiDirectional ctor called')
 
-        super().__init__(maze, neighbor_method, quiet_mode)
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
         self.name = "Bi Directional"
+        self.trace = trace
 
     def solve(self):
 
-        """Function that implements a bidirectional depth-first recursive backtracker algorithm for
-        solving the maze, i.e. starting at the entry point and exit points where each search searches
-        for the other search path. NOTE: THE FUNCTION ENDS IN AN INFINITE LOOP FOR SOME RARE CASES OF
-        THE INPUT MAZE. WILL BE FIXED IN FUTURE."""
+        """Function that implements a bidirectional breadth-first search for solving the maze, i.e.
+        starting at the entry point and exit points where each search searches for the other search.
+        The search that has the smaller frontier grows by one full level at a time. Once a level
+        reaches cells of the other search, the shortest connection found in that level is the
+        shortest route. Terminates on every maze; if there is no route the path is empty."""
         logging.debug("Class BiDirectional solve called")
 
-        grid = self.maze.grid
-        k_curr, l_curr = self.maze.entry_coor            # Where to start the first search
-        p_curr, q_curr = self.maze.exit_coor             # Where to start the second search
-        grid[k_curr][l_curr].visited = True    # Set initial cell to visited
-        grid[p_curr][q_curr].visited = True    # Set final cell to visited
-        backtrack_kl = list()                  # Stack of visited cells for backtracking
-        backtrack_pq = list()                  # Stack of visited cells for backtracking
-        path_kl = list()                       # To track path of solution and backtracking cells
-        path_pq = list()                       # To track path of solution and backtracking cells
+        num_rows, num_cols = self.maze.num_rows, self.maze.num_cols
+        graph = self.maze.adjacency()
+        offsets, neighbours = graph.offsets, graph.neighbours
+        start = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]
+        goal = self.maze.exit_coor[0]*num_cols + self.maze.exit_coor[1]
+
+        owner = bytearray(num_rows*num_cols)                # 1 for the entry search, 2 for the exit search
+        parent = array("i", [-1]) * (num_rows*num_cols)     # Cell each cell was reached from
+        depth = array("i", [0]) * (num_rows*num_cols)       # Distance to the start of the owning search
+        owner[start] = 1
+        owner[goal] = 2
+        frontiers = {1: [start], 2: [goal]}
+        expanded = list()
+        meeting = None      # (cell of entry search, cell of exit search) of the shortest connection
+        best_length = -1
+
+        if not self.quiet_mode:
+            print("\nSolving the maze with bidirectional breadth-first search...")
+        time_start = time.time()
+
+        while frontiers[1] and frontiers[2] and meeting is None:
+            side = 1 if len(frontiers[1]) <= len(frontiers[2]) else 2
+            other_side = 3 - side
+            next_level = list()
+
+            for cell in frontiers[side]:
+                expanded.append(cell)
+                for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                    if owner[neighbour] == other_side:      # The searches meet
+                        length = depth[cell] + 1 + depth[neighbour]
+                        if meeting is None or length < best_length:
+                            best_length = length
+                            meeting = (cell, neighbour) if side == 1 else (neighbour, cell)
+                    elif not owner[neighbour]:
+                        owner[neighbour] = side
+                        parent[neighbour] = cell
+                        depth[neighbour] = depth[cell] + 1
+                        next_level.append(neighbour)
+
+            frontiers[side] = next_level
+
+        if meeting is None:
+            self.path = list()
+            path = MazePath.for_maze(self.maze, flags=True)
+        else:
+            # The meeting cell of the other search may still be waiting in its frontier
+            other_cell = meeting[1] if side == 1 else meeting[0]
+            if other_cell in frontiers[other_side]:
+                expanded.append(other_cell)
+
+            # Reverse the parent pointers of the exit search so they all lead back to the entry
+            previous, cell = meeting
+            while cell != -1:
+                parent[cell], previous, cell = previous, cell, parent[cell]
+            path = self._route_path(parent, goal, expanded if self.trace else None)
 
         if not self.quiet_mode:
-            print("\nSolving the maze with bidirectional depth-first search...")
-        time_start = time.clock()
-
-        while True:   # Loop until return statement is encountered
-            neighbours_kl = self.maze.find_neighbours(k_curr, l_curr)    # Find neighbours for first search
-            real_neighbours_kl = [neigh for neigh in neighbours_kl if not grid[k_curr][l_curr].is_walls_between(grid[neigh[0]][neigh[1]])]
-            neighbours_kl = [neigh for neigh in real_neighbours_kl if not grid[neigh[0]][neigh[1]].visited]
-
-            neighbours_pq = self.maze.find_neighbours(p_curr, q_curr)    # Find neighbours for second search
-            real_neighbours_pq = [neigh for neigh in neighbours_pq if not grid[p_curr][q_curr].is_walls_between(grid[neigh[0]][neigh[1]])]
-            neighbours_pq = [neigh for neigh in real_neighbours_pq if not grid[neigh[0]][neigh[1]].visited]
-
-            if len(neighbours_kl) > 0:   # If there are unvisited neighbour cells
-                backtrack_kl.append((k_curr, l_curr))              # Add current cell to stack
-                path_kl.append(((k_curr, l_curr), False))          # Add coordinates to part of search path
-                k_next, l_next = random.choice(neighbours_kl)      # Choose random neighbour
-                grid[k_next][l_next].visited = True                # Move to that neighbour
-                k_curr = k_next
-                l_curr = l_next
-
-            elif len(backtrack_kl) > 0:                  # If there are no unvisited neighbour cells
-                path_kl.append(((k_curr, l_curr), True))   # Add coordinates to part of search path
-                k_curr, l_curr = backtrack_kl.pop()        # Pop previous visited cell (backtracking)
-
-            if len(neighbours_pq) > 0:                        # If there are unvisited neighbour cells
-                backtrack_pq.append((p_curr, q_curr))           # Add current cell to stack
-                path_pq.append(((p_curr, q_curr), False))       # Add coordinates to part of search path
-                p_next, q_next = random.choice(neighbours_pq)   # Choose random neighbour
-                grid[p_next][q_next].visited = True             # Move to that neighbour
-                p_curr = p_next
-                q_curr = q_next
-
-            elif len(backtrack_pq) > 0:                  # If there are no unvisited neighbour cells
-                path_pq.append(((p_curr, q_curr), True))   # Add coordinates to part of search path
-                p_curr, q_curr = backtrack_pq.pop()        # Pop previous visited cell (backtracking)
-
-            # Exit loop and return path if any opf the kl neighbours are in path_pq.
-            if any((True for n_kl in real_neighbours_kl if (n_kl, False) in path_pq)):
-                path_kl.append(((k_curr, l_curr), False))
-                path = [p_el for p_tuple in zip(path_kl, path_pq) for p_el in p_tuple]  # Zip paths
-                if not self.quiet_mode:
-                    print("Number of moves performed: {}".format(len(path)))
-                    print("Execution time for algorithm: {:.4f}".format(time.clock() - time_start))
-                logging.debug("Class BiDirectional leaving solve")
-                return path
-
-            # Exit loop and return path if any opf the pq neighbours are in path_kl.
-            elif any((True for n_pq in real_neighbours_pq if (n_pq, False) in path_kl)):
-                path_pq.append(((p_curr, q_curr), False))
-                path = [p_el for p_tuple in zip(path_kl, path_pq) for p_el in p_tuple]  # Zip paths
-                if not self.quiet_mode:
-                    print("Number of moves performed: {}".format(len(path)))
-                    print("Execution time for algorithm: {:.4f}".format(time.clock() - time_start))
-                logging.debug("Class BiDirectional leaving solve")
-                return path
+            print("Number of moves performed: {}".format(len(path)))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+        logging.debug("Class BiDirectional leaving solve")
+        return path
 
 
 class DepthFirstBacktracker(Solver):
@@ -178,41 +260,262 @@ class DepthFirstBacktracker(Solver):
     def __init__(self, maze, quiet_mode=False,  neighbor_method="fancy"):
         logging.debug('Class DepthFirstBacktracker ctor called')
 
-        super().__init__(maze, neighbor_method, quiet_mode)
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
         self.name = "Depth First Backtracker"
 
     def solve(self):
         logging.debug("Class DepthFirstBacktracker solve called")
-        k_curr, l_curr = self.maze.entry_coor      # Where to start searching
-        self.maze.grid[k_curr][l_curr].visited = True     # Set initial cell to visited
+        num_cols = self.maze.num_cols
+        graph = self.maze.adjacency()
+        offsets, neighbours = graph.offsets, graph.neighbours
+        visit_stamps, epoch = self._new_search()
+        k_end, l_end = self.maze.exit_coor
+        goal = k_end*num_cols + l_end
+
+        cell = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]  # Where to start searching
+        visit_stamps[cell] = epoch              # Set initial cell to visited
         visited_cells = list()                  # Stack of visited cells for backtracking
-        path = list()                           # To track path of solution and backtracking cells
+        path = MazePath.for_maze(self.maze, flags=True)     # To track path of solution and backtracking cells
         if not self.quiet_mode:
             print("\nSolving the maze with depth-first search...")
 
         time_start = time.time()
 
-        while (k_curr, l_curr) != self.maze.exit_coor:     # While the exit cell has not been encountered
-            neighbour_indices = self.maze.find_neighbours(k_curr, l_curr)    # Find neighbour indices
-            neighbour_indices = self.maze.validate_neighbours_solve(neighbour_indices, k_curr,
-                l_curr, self.maze.exit_coor[0], self.maze.exit_coor[1], self.neighbor_method)
+        while cell != goal:     # While the exit cell has not been encountered
+            unvisited = [n for n in neighbours[offsets[cell]:offsets[cell+1]] if visit_stamps[n] != epoch]
+            if unvisited and self.neighbor_method == "fancy":
+                # Only keep the neighbour closest to the exit
+                unvisited = [min(unvisited, key=lambda n: (n // num_cols - k_end)**2 + (n % num_cols - l_end)**2)]
 
-            if neighbour_indices is not None:   # If there are unvisited neighbour cells
-                visited_cells.append((k_curr, l_curr))              # Add current cell to stack
-                path.append(((k_curr, l_curr), False))  # Add coordinates to part of search path
-                k_next, l_next = random.choice(neighbour_indices)   # Choose random neighbour
-                self.maze.grid[k_next][l_next].visited = True                 # Move to that neighbour
-                k_curr = k_next
-                l_curr = l_next
+            if unvisited:   # If there are unvisited neighbour cells
+                visited_cells.append(cell)              # Add current cell to stack
+                path.append_cell(cell)                  # Add cell to part of search path
+                cell = random.choice(unvisited)         # Choose random neighbour
+                visit_stamps[cell] = epoch              # Move to that neighbour
 
             elif len(visited_cells) > 0:              # If there are no unvisited neighbour cells
-                path.append(((k_curr, l_curr), True))   # Add coordinates to part of search path
-                k_curr, l_curr = visited_cells.pop()    # Pop previous visited cell (backtracking)
+                path.append_cell(cell, True)            # Add cell to part of search path
+                cell = visited_cells.pop()              # Pop previous visited cell (backtracking)
 
-        path.append(((k_curr, l_curr), False))  # Append final location to path
+        path.append_cell(cell)                  # Append final location to path
         if not self.quiet_mode:
             print("Number of moves performed: {}".format(len(path)))
             print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
 
         logging.debug('Class DepthFirstBacktracker leaving solve')
         return path
+
+
+class AStar(Solver):
+    """A solver that implements A* search with the Manhattan distance to the exit as heuristic.
+    Since every step costs one and the heuristic never overestimates, the route found is a
+    shortest one. The returned path lists every expanded cell in the order of expansion, with
+    the cells that are not on the route marked like backtracked cells. The route itself is
+    available through get_path.
+    """
+
+    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy"):
+        logging.debug('Class AStar ctor called')
+
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+        self.name = "A Star"
+
+    def solve(self):
+        logging.debug("Class AStar solve called")
+        num_rows, num_cols = self.maze.num_rows, self.maze.num_cols
+        graph = self.maze.adjacency()
+        offsets, neighbours = graph.offsets, graph.neighbours
+        k_end, l_end = self.maze.exit_coor
+        start = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]
+        goal = k_end*num_cols + l_end
+
+        g_score = array("i", [-1]) * (num_rows*num_cols)    # Length of the best known route to each cell
+        parent = array("i", [-1]) * (num_rows*num_cols)     # Previous cell on that route
+        closed = bytearray(num_rows*num_cols)               # Cells that have been expanded
+        expanded = list()                                   # Expanded cells in order
+        g_score[start] = 0
+        # Entries are (f, -g, cell), so ties in f are broken in favour of the deeper cell
+        heap = [(abs(k_end - self.maze.entry_coor[0]) + abs(l_end - self.maze.entry_coor[1]), 0, start)]
+
+        if not self.quiet_mode:
+            print("\nSolving the maze with A* search...")
+        time_start = time.time()
+
+        while heap:
+            _, neg_g_curr, cell = heappop(heap)
+            if closed[cell]:    # Stale entry, the cell was reached by a shorter route before
+                continue
+            closed[cell] = 1
+            expanded.append(cell)
+            if cell == goal:
+                break
+
+            g_next = 1 - neg_g_curr     # One step further than the current cell
+            for neighbour in neighbours[offsets[cell]:offsets[cell+1]]:
+                if not closed[neighbour] and (g_score[neighbour] < 0 or g_next < g_score[neighbour]):
+                    g_score[neighbour] = g_next
+                    parent[neighbour] = cell
+                    k_next, l_next = divmod(neighbour, num_cols)
+                    heappush(heap, (g_next + abs(k_end - k_next) + abs(l_end - l_next), -g_next, neighbour))
+
+        if closed[goal]:
+            path = self._route_path(parent, goal, expanded)
+        else:       # The exit can not be reached
+            self.path = list()
+            path = MazePath.for_maze(self.maze, flags=True)
+        if not self.quiet_mode:
+            print("Number of moves performed: {}".format(len(path)))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+        logging.debug('Class AStar leaving solve')
+        return path
+
+
+class CorridorAStar(Solver):
+    """A solver that runs A* search on the corridor graph of the maze (see Maze.corridor_graph),
+    where every corridor is a single weighted edge between junctions, dead ends, the entry and the
+    exit. Only nodes are expanded; the route is expanded back into cells at the end. The returned
+    path lists the expanded nodes that are not on the route as backtracked cells, and every cell of
+    the route in order, as the nodes on the route are expanded.
+    """
+
+    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy"):
+        logging.debug('Class CorridorAStar ctor called')
+
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+        self.name = "Corridor A Star"
+
+    def solve(self):
+        logging.debug("Class CorridorAStar solve called")
+        num_cols = self.maze.num_cols
+        graph = self.maze.corridor_graph()
+        node_cells, edge_offsets = graph.node_cells, graph.edge_offsets
+        edge_targets, edge_lengths = graph.edge_targets, graph.edge_lengths
+        k_end, l_end = self.maze.exit_coor
+        start = graph.node_of[self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]]
+        goal = graph.node_of[k_end*num_cols + l_end]
+
+        g_score = array("i", [-1]) * graph.num_nodes()      # Length of the best known route to each node
+        parent_edge = array("i", [-1]) * graph.num_nodes()  # Edge of that route leading to the node
+        parent = array("i", [-1]) * graph.num_nodes()       # Node that edge starts at
+        closed = bytearray(graph.num_nodes())
+        expanded = list()
+        g_score[start] = 0
+        heap = [(abs(k_end - self.maze.entry_coor[0]) + abs(l_end - self.maze.entry_coor[1]), 0, start)]
+
+        if not self.quiet_mode:
+            print("\nSolving the maze with A* search on the corridor graph...")
+        time_start = time.time()
+
+        while heap:
+            _, neg_g_curr, node = heappop(heap)
+            if closed[node]:    # Stale entry, the node was reached by a shorter route before
+                continue
+            closed[node] = 1
+            expanded.append(node)
+            if node == goal:
+                break
+
+            for edge in range(edge_offsets[node], edge_offsets[node+1]):
+                target = edge_targets[edge]
+                g_next = edge_lengths[edge] - neg_g_curr
+                if not closed[target] and (g_score[target] < 0 or g_next < g_score[target]):
+                    g_score[target] = g_next
+                    parent_edge[target] = edge
+                    parent[target] = node
+                    k_next, l_next = divmod(node_cells[target], num_cols)
+                    heappush(heap, (g_next + abs(k_end - k_next) + abs(l_end - l_next), -g_next, target))
+
+        # Nodes on the route, and the cells leading to each of them from the previous node
+        route_cells = dict()
+        node = goal if closed[goal] else -1
+        while node != start and node != -1:
+            route_cells[node] = graph.corridor(parent[node], parent_edge[node])
+            node = parent[node]
+        if node == start:
+            route_cells[start] = [node_cells[start]]
+
+        path = MazePath.for_maze(self.maze, flags=True)
+        for node in expanded:
+            if node in route_cells:
+                for cell in route_cells[node]:
+                    path.append_cell(cell)
+            else:
+                path.append_cell(node_cells[node], True)
+        self.path = [coor for coor, backtracked in path if not backtracked]
+
+        if not self.quiet_mode:
+            print("Number of nodes expanded: {}".format(len(expanded)))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+        logging.debug('Class CorridorAStar leaving solve')
+        return path
+
+
+class DiskBreadthFirst(Solver):
+    """A breadth-first search for mazes larger than the memory, e.g. mazes with the mmap backend.
+    Instead of a graph in memory, the direction each cell was reached from is kept in a scratch
+    file mapped with numpy.memmap, and the search expands a whole level of cells at a time with
+    array operations on the walls. The cells of every level are sorted, so the walls and the
+    scratch file are read in file order. Only the route is returned, as cells that are not
+    backtracked, or an empty list if the exit can not be reached.
+
+    Attributes:
+        directory (string): Where the scratch file is created, defaults to the system temp directory
+    """
+
+    def __init__(self, maze, quiet_mode=False, neighbor_method="fancy", directory=None):
+        logging.debug('Class DiskBreadthFirst ctor called')
+
+        super().__init__(maze, quiet_mode=quiet_mode, neighbor_method=neighbor_method)
+        self.name = "Disk Breadth First"
+        self.directory = directory
+
+    def solve(self):
+        logging.debug("Class DiskBreadthFirst solve called")
+        num_rows, num_cols = self.maze.num_rows, self.maze.num_cols
+        walls = self.maze.get_wall_bits().reshape(-1)
+        step = (-num_cols, 1, num_cols, -1)     # Index offset of every direction
+        start = self.maze.entry_coor[0]*num_cols + self.maze.entry_coor[1]
+        goal = self.maze.exit_coor[0]*num_cols + self.maze.exit_coor[1]
+
+        if not self.quiet_mode:
+            print("\nSolving the maze with breadth-first search on disk...")
+        time_start = time.time()
+
+        with tempfile.TemporaryFile(dir=self.directory) as scratch:
+            # 0 for cells that were not reached, otherwise 1 + the direction back to the previous cell
+            came_from = np.memmap(scratch, dtype=np.uint8, mode="w+", shape=(num_rows*num_cols,))
+            came_from[start] = 5
+            level = np.array([start], dtype=np.int64)
+            while len(level) and not came_from[goal]:
+                level_walls = walls[level]
+                rows, cols = level // num_cols, level % num_cols
+                inside = (rows > 0, cols < num_cols - 1, rows < num_rows - 1, cols > 0)
+                next_level = list()
+                for direction in range(4):
+                    is_open = (((level_walls >> direction) & 1) == 0) & inside[direction]
+                    targets = level[is_open] + step[direction]
+                    targets = targets[came_from[targets] == 0]
+                    came_from[targets] = OPPOSITE[direction] + 1
+                    next_level.append(targets)
+                level = np.unique(np.concatenate(next_level))
+
+            route = list()
+            if came_from[goal]:
+                cell = goal
+                while cell != start:
+                    route.append(divmod(cell, num_cols))
+                    cell += step[came_from[cell] - 1]
+                route.append(divmod(start, num_cols))
+            del came_from
+
+        self.path = route[::-1]
+        path = MazePath.for_maze(self.maze, flags=True)
+        path.extend((coor, False) for coor in self.path)
+        if not self.quiet_mode:
+            print("Number of moves performed: {}".format(len(path)))
+            print("Execution time for algorithm: {:.4f}".format(time.time() - time_start))
+
+        logging.debug("Class DiskBreadthFirst leaving solve")
+        return path
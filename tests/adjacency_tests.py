@@ -0,0 +1,62 @@
+from __future__ import absolute_import
+import os
+import tempfile
+import unittest
+
+from src.adjacency import Adjacency
+from src.maze import Maze
+
+
+class TestAdjacency(unittest.TestCase):
+    def test_from_wall_bits(self):
+        """Test that the graph has one symmetric edge per passage of the maze"""
+        maze = Maze(7, 5, algorithm="kruskal")
+        graph = maze.adjacency()
+
+        self.assertEqual(len(graph.offsets), maze.grid_size + 1)
+        self.assertEqual(graph.num_edges(), maze.grid_size - 1)
+        for cell in range(maze.grid_size):
+            k, l = divmod(cell, maze.num_cols)
+            for neighbour in graph.neighbours_of(cell):
+                k_n, l_n = divmod(neighbour, maze.num_cols)
+                self.assertFalse(maze.grid[k][l].is_walls_between(maze.grid[k_n][l_n]))
+                self.assertIn(cell, graph.neighbours_of(neighbour))
+            self.assertEqual(graph.degree(cell), len(graph.neighbours_of(cell)))
+
+    def test_entry_exit_excluded(self):
+        """The opened boundary walls of the entry and exit do not lead to other cells"""
+        graph = Adjacency.from_wall_bits([[15 & ~1 & ~2, 15 & ~8]])
+        self.assertEqual(list(graph.neighbours_of(0)), [1])
+        self.assertEqual(list(graph.neighbours_of(1)), [0])
+
+    def test_cache(self):
+        """Test that the graph is cached and rebuilt when the walls change"""
+        maze = Maze(4, 4, backend="packed")
+        graph = maze.adjacency()
+        self.assertIs(maze.adjacency(), graph)
+
+        maze.set_wall_bits(maze.get_wall_bits() | 15)
+        self.assertEqual(maze.adjacency().num_edges(), 0)
+
+    def test_export(self):
+        """Test the NumPy views, the edge list and saving and loading the graph"""
+        maze = Maze(6, 6, algorithm="wilson")
+        graph = maze.adjacency()
+
+        offsets, neighbours = graph.to_numpy()
+        self.assertEqual(offsets[-1], len(neighbours))
+        edges = graph.edge_list()
+        self.assertEqual(edges.shape, (maze.grid_size - 1, 2))
+        self.assertTrue((edges[:, 0] < edges[:, 1]).all())
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.npz")
+            graph.save(filename)
+            loaded = Adjacency.load(filename)
+        self.assertEqual((loaded.num_rows, loaded.num_cols), (6, 6))
+        self.assertEqual(loaded.offsets, graph.offsets)
+        self.assertEqual(loaded.neighbours, graph.neighbours)
+
+
+if __name__ == "__main__":
+    unittest.main()
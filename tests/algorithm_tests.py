@@ -5,6 +5,7 @@ import unittest
 # import all algorithms present in algorithm.py
 from src.algorithm import *
 from src.maze import Maze
+import random
 
 def create_maze(algorithm):
     rows, cols = (5,5)
@@ -76,3 +77,117 @@ class TestAlgorithm(unittest.TestCase):
                 for cell in row:
                     # check that the cell does not have walls on all four sides
                     self.assertNotEqual( cell.walls, walls_4, msg = err_msg )
+
+    def test_PerfectMaze(self):
+        """Test that every algorithm carves a perfect maze, i.e. all cells are connected
+        and there is exactly one route between any two cells"""
+        for algorithm in algorithm_list:
+            maze = Maze(7, 9, algorithm = algorithm)
+            err_msg = f'Algorithm {algorithm} did not generate a perfect maze'
+
+            # count the passages, a spanning tree of n cells has n - 1 edges
+            passages = 0
+            for i in range(maze.num_rows):
+                for j in range(maze.num_cols):
+                    if j + 1 < maze.num_cols and not maze.grid[i][j].is_walls_between(maze.grid[i][j+1]):
+                        passages += 1
+                    if i + 1 < maze.num_rows and not maze.grid[i][j].is_walls_between(maze.grid[i+1][j]):
+                        passages += 1
+            self.assertEqual(passages, maze.grid_size - 1, msg = err_msg)
+
+            # the generation path must reach every cell and only step between adjacent cells
+            self.assertEqual(len(set(maze.generation_path)), maze.grid_size, msg = err_msg)
+
+    def test_TiledBacktracker(self):
+        """Test that joining tiles gives a perfect maze, also with partial tiles at the borders"""
+        for tile_size in [1, 3, 4, 20]:
+            maze = Maze(10, 13, algorithm = None, backend = "packed")
+            tiled_backtracker(maze, (0, 0), tile_size = tile_size)
+            self.assertEqual(maze.adjacency().num_edges(), maze.grid_size - 1)
+            field = maze.get_distance_field(maze.entry_coor)
+            self.assertNotIn(-1, list(field.distances))
+
+    def test_GenerationSteps(self):
+        """Test that the steps reported to a sink and streamed from a maze match its path"""
+        for algorithm in algorithm_list:
+            events = list()
+            maze = Maze(6, 7, algorithm = None, seed = 21)
+            maze.generate_maze(algorithm, (0, 0), lambda event, coor: events.append((event, coor)))
+            err_msg = f'Algorithm {algorithm} reported wrong steps'
+
+            self.assertEqual(events[0][0], "start", msg = err_msg)
+            self.assertEqual(sum(event == "carve" for event, _ in events), maze.grid_size - 1, msg = err_msg)
+            self.assertEqual(list(maze.generation_steps()), events, msg = err_msg)
+            self.assertEqual(maze.generation_path, [coor for _, coor in events], msg = err_msg)
+
+            # a recorded path is the same as the replayed one
+            recorded = Maze(6, 7, algorithm = algorithm, seed = 21, record_generation_path = True)
+            self.assertIsNone(recorded._generation_path_builder, msg = err_msg)
+            self.assertEqual(recorded.generation_path, maze.generation_path, msg = err_msg)
+
+    def test_BinaryTreeBias(self):
+        """Test that the binary tree generator only carves down or to the right"""
+        maze = Maze(6, 6, algorithm = "bin_tree", backend = "packed")
+        walls = maze.get_wall_bits()
+        for i in range(maze.num_rows - 1):
+            for j in range(maze.num_cols - 1):
+                # exactly one of the bottom and right walls was removed
+                self.assertEqual(bool(walls[i, j] & 4) + bool(walls[i, j] & 2), 1)
+        # the bottom row is one long corridor
+        for j in range(maze.num_cols - 1):
+            self.assertFalse(maze.grid[5][j].walls["right"])
+
+        path = maze.generation_path
+        self.assertEqual(path[0], (5, 5))
+        for (k, l), (k_next, l_next) in zip(path, path[1:]):
+            self.assertEqual(abs(k - k_next) + abs(l - l_next), 1)
+
+    def test_EllerRows(self):
+        """Test that the rows streamed by eller_rows fit together"""
+        rows, cols = (8, 6)
+        streamed = [bytes(row_walls) for row_walls in eller_rows(rows, cols, random.Random(4))]
+        self.assertEqual(len(streamed), rows)
+
+        passages = 0
+        for i, row_walls in enumerate(streamed):
+            self.assertEqual(len(row_walls), cols)
+            # the outer boundary stays closed
+            self.assertTrue(row_walls[0] & 8)
+            self.assertTrue(row_walls[-1] & 2)
+            for j in range(cols - 1):
+                self.assertEqual(bool(row_walls[j] & 2), bool(row_walls[j+1] & 8))
+                passages += not row_walls[j] & 2
+            for j in range(cols):
+                if i + 1 < rows:
+                    self.assertEqual(bool(row_walls[j] & 4), bool(streamed[i+1][j] & 1))
+                    passages += not row_walls[j] & 4
+        self.assertTrue(all(row_walls & 1 for row_walls in streamed[0]))
+        self.assertTrue(all(row_walls & 4 for row_walls in streamed[-1]))
+        self.assertEqual(passages, rows*cols - 1)
+
+    def test_DisjointSet(self):
+        """Test the union-find used by the Kruskal generator"""
+        sets = DisjointSet(6)
+        self.assertTrue(sets.union(0, 1))
+        self.assertTrue(sets.union(2, 3))
+        self.assertFalse(sets.union(1, 0))
+        self.assertNotEqual(sets.find(0), sets.find(2))
+        self.assertTrue(sets.union(1, 3))
+        self.assertEqual(sets.find(0), sets.find(2))
+        self.assertNotEqual(sets.find(4), sets.find(5))
+
+    def test_WilsonUniform(self):
+        """Test that Wilson's algorithm picks each of the four spanning trees of a 2x2 grid
+        equally often"""
+        random.seed(7)
+        counts = dict()
+        for _ in range(400):
+            maze = Maze(2, 2, algorithm = "wilson")
+            # the tree is identified by the one interior wall that is left standing
+            walls = (maze.grid[0][0].walls["right"], maze.grid[0][0].walls["bottom"],
+                     maze.grid[1][1].walls["top"], maze.grid[1][1].walls["left"])
+            counts[walls] = counts.get(walls, 0) + 1
+
+        self.assertEqual(len(counts), 4)
+        for count in counts.values():
+            self.assertTrue(60 < count < 140)
@@ -1,6 +1,6 @@
 from __future__ import absolute_import
 import unittest
-from src.cell import Cell
+from src.cell import Cell, TOP, RIGHT, BOTTOM, LEFT, ALL_WALLS
 
 
 class TestCell(unittest.TestCase):
@@ -105,6 +105,32 @@ class TestCell(unittest.TestCase):
         # check that there are no walls between these cells
         self.assertEqual(cell.is_walls_between(cell_top), False)
 
+        # cells that are not adjacent never share a wall
+        self.assertEqual(cell.is_walls_between(Cell(3, 3)), False)
+
+    def test_wall_bits(self):
+        """Test the direction indexed wall operations and the walls view"""
+        cell = Cell(1, 1)
+        self.assertEqual(cell.wall_bits, ALL_WALLS)
+        self.assertFalse(hasattr(cell, "__dict__"))
+
+        self.assertEqual(cell.direction_to(0, 1), TOP)
+        self.assertEqual(cell.direction_to(1, 2), RIGHT)
+        self.assertEqual(cell.direction_to(2, 1), BOTTOM)
+        self.assertEqual(cell.direction_to(1, 0), LEFT)
+        self.assertIsNone(cell.direction_to(3, 1))
+
+        cell.remove_wall(LEFT)
+        self.assertFalse(cell.has_wall(LEFT))
+        self.assertTrue(cell.has_wall(RIGHT))
+        self.assertEqual(cell.walls["left"], False)
+
+        cell.walls["left"] = True
+        cell.walls["top"] = False
+        self.assertTrue(cell.has_wall(LEFT))
+        self.assertFalse(cell.has_wall(TOP))
+        self.assertEqual(dict(cell.walls), {"top": False, "right": True, "bottom": True, "left": True})
+
 
 
 if __name__ == "__main__":
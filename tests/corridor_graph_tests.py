@@ -0,0 +1,49 @@
+from __future__ import absolute_import
+import unittest
+
+from src.maze import Maze
+from src.corridor_graph import CorridorGraph
+from src.adjacency import Adjacency
+
+
+class TestCorridorGraph(unittest.TestCase):
+    def test_comb(self):
+        """Test the nodes and edges of a comb shaped maze"""
+        # the top row is a corridor and every column hangs below it
+        walls = [[15 & ~4 & ~2, 15 & ~4 & ~2 & ~8, 15 & ~4 & ~8],
+                 [15 & ~1 & ~4, 15 & ~1 & ~4, 15 & ~1 & ~4],
+                 [15 & ~1, 15 & ~1, 15 & ~1]]
+        graph = CorridorGraph(Adjacency.from_wall_bits(walls))
+
+        # (0, 1) is the only junction, the bottom row holds the dead ends
+        self.assertEqual(list(graph.node_cells), [1, 6, 7, 8])
+        self.assertEqual(graph.node_of[0], -1)
+        junction = graph.node_of[1]
+        edges = range(graph.edge_offsets[junction], graph.edge_offsets[junction+1])
+        self.assertEqual(sorted((graph.node_cells[graph.edge_targets[edge]], graph.edge_lengths[edge])
+                                for edge in edges), [(6, 3), (7, 2), (8, 3)])
+        left = [edge for edge in edges if graph.edge_targets[edge] == graph.node_of[6]][0]
+        self.assertEqual(graph.corridor(junction, left), [0, 3, 6])
+
+        # kept cells become nodes even inside a corridor
+        graph = CorridorGraph(Adjacency.from_wall_bits(walls), keep=[(1, 0)])
+        self.assertEqual(list(graph.node_cells), [1, 3, 6, 7, 8])
+
+    def test_maze(self):
+        """Test that the edges of a generated maze add up to its passages"""
+        maze = Maze(15, 17, algorithm="wilson", backend="packed")
+        graph = maze.corridor_graph()
+        self.assertIs(maze.corridor_graph(), graph)
+        self.assertGreaterEqual(graph.node_of[maze.entry_coor[0]*maze.num_cols + maze.entry_coor[1]], 0)
+        self.assertGreaterEqual(graph.node_of[maze.exit_coor[0]*maze.num_cols + maze.exit_coor[1]], 0)
+
+        # every passage lies on exactly one corridor, which is stored once from each end
+        self.assertEqual(sum(graph.edge_lengths), 2*maze.adjacency().num_edges())
+        self.assertEqual(len(graph.edge_targets), 2*(graph.num_nodes() - 1))
+
+        maze.set_wall_bits(maze.get_wall_bits())
+        self.assertIsNot(maze.corridor_graph(), graph)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+from __future__ import absolute_import
+import unittest
+
+from src.maze import Maze
+from src.solver import BreadthFirst
+
+
+class TestDistanceField(unittest.TestCase):
+    def test_distances(self):
+        """Test that the distances match the routes found by breadth-first search"""
+        maze = Maze(9, 8, algorithm="wilson")
+        solver = BreadthFirst(maze, quiet_mode=True, trace=False)
+        solver.solve()
+        route = solver.get_path()
+
+        self.assertEqual(maze.distance(maze.exit_coor), 0)
+        self.assertEqual(maze.distance(maze.entry_coor), len(route) - 1)
+        self.assertEqual(maze.distance(maze.exit_coor, source=maze.entry_coor), len(route) - 1)
+        for i in range(maze.num_rows):
+            for j in range(maze.num_cols):
+                self.assertGreaterEqual(maze.distance((i, j)), 0)
+
+    def test_path_to_source(self):
+        """Test walking down the distances back to the source"""
+        maze = Maze(9, 8, algorithm="kruskal")
+        solver = BreadthFirst(maze, quiet_mode=True, trace=False)
+        solver.solve()
+
+        self.assertEqual(maze.path_to_source(maze.entry_coor), solver.get_path())
+        self.assertEqual(maze.path_to_source(maze.exit_coor), [maze.exit_coor])
+
+    def test_cache(self):
+        """Test that the fields are cached per source and evicted least recently used first"""
+        maze = Maze(5, 5, backend="packed")
+        maze.distance_cache_size = 2
+
+        field = maze.get_distance_field()
+        self.assertIs(maze.get_distance_field(maze.exit_coor), field)
+        maze.get_distance_field((0, 0))
+        self.assertIs(maze.get_distance_field(), field)
+        maze.get_distance_field((1, 1))     # evicts (0, 0)
+        self.assertIs(maze.get_distance_field(), field)
+        self.assertIsNot(maze.get_distance_field((1, 1)), maze.get_distance_field((0, 0)))
+
+        maze.set_wall_bits(maze.get_wall_bits())
+        self.assertIsNot(maze.get_distance_field(), field)
+
+
+if __name__ == "__main__":
+    unittest.main()
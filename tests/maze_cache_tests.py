@@ -0,0 +1,54 @@
+from __future__ import absolute_import
+import unittest
+import tempfile
+
+from src.maze import Maze
+from src.maze_cache import MazeCache
+
+
+class TestMazeCache(unittest.TestCase):
+    def test_memory(self):
+        """Test that repeated requests are answered from memory with the same maze"""
+        cache = MazeCache(max_size=2)
+        maze = cache.get_maze(6, 8, "dfs_backtrack", seed=5)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        cached = cache.get_maze(6, 8, "dfs_backtrack", seed=5, id=3)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsNot(cached, maze)
+        self.assertEqual(cached.id, 3)
+        self.assertEqual(cached.to_bytes(), maze.to_bytes())
+        self.assertEqual(cached.generation_path, maze.generation_path)
+
+        # every part of the key matters
+        cache.get_maze(6, 8, "kruskal", seed=5)
+        cache.get_maze(6, 8, "dfs_backtrack", seed=5, entry_coor=(0, 0), exit_coor=(5, 7))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertEqual(len(cache), 2)
+
+        # the least recently used maze was evicted
+        cache.get_maze(6, 8, "dfs_backtrack", seed=5)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+        # mazes without a seed are not cached
+        cache.get_maze(6, 8, "dfs_backtrack")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 4, 2))
+
+    def test_disk(self):
+        """Test that a second cache finds the mazes stored on disk by the first one"""
+        with tempfile.TemporaryDirectory() as directory:
+            maze = MazeCache(directory=directory).get_maze(5, 5, "wilson", seed=8, backend="packed")
+
+            cache = MazeCache(directory=directory)
+            cached = cache.get_maze(5, 5, "wilson", seed=8)
+            self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (1, 1, 0))
+            self.assertEqual(cached.backend, "cells")
+            self.assertEqual(cached.to_bytes(), maze.to_bytes())
+            self.assertEqual(cached.entry_coor, Maze(5, 5, algorithm="wilson", seed=8).entry_coor)
+
+            cache.get_maze(5, 5, "wilson", seed=8)
+            self.assertEqual((cache.hits, cache.disk_hits), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 from __future__ import absolute_import
 import unittest
+import tempfile
+import os
 
 from src.maze_manager import MazeManager
 from src.maze_viz import Visualizer
-from src.maze import Maze
+from src.maze import Maze, derive_seed
 
 
 class TestMgr(unittest.TestCase):
@@ -90,6 +92,95 @@ class TestMgr(unittest.TestCase):
         result = [manager.check_matching_id(1)]
         self.assertEqual(len(result), 1)
 
+    def test_remove_maze(self):
+        """Test that removed mazes are gone and that their ids are not given out again"""
+        manager = MazeManager()
+        maze1 = manager.add_maze(4, 4)
+        maze2 = manager.add_maze(4, 4)
+        self.assertNotEqual(maze1.id, maze2.id)
+
+        self.assertTrue(manager.remove_maze(maze1.id))
+        self.assertFalse(manager.remove_maze(maze1.id))
+        self.assertIsNone(manager.get_maze(maze1.id))
+        self.assertEqual(manager.get_mazes(), [maze2])
+
+        maze3 = manager.add_maze(4, 4)
+        self.assertNotIn(maze3.id, [maze1.id, maze2.id])
+        self.assertFalse(manager.add_existing_maze(maze2, override=False))
+        self.assertEqual(manager.get_maze_count(), 2)
+
+    def test_memory_budget(self):
+        """Test that the least recently used mazes are dropped or spilled to disk"""
+        # the generation path of kruskal is only created when accessed, so all mazes are equally large
+        size = Maze(10, 10, algorithm="kruskal", backend="packed").nbytes()
+
+        manager = MazeManager(memory_budget=2*size)
+        ids = [manager.add_existing_maze(Maze(10, 10, algorithm="kruskal", backend="packed")).id for _ in range(3)]
+        self.assertEqual(manager.get_maze_count(), 2)
+        self.assertIsNone(manager.get_maze(ids[0]))
+        self.assertLessEqual(manager.get_memory_usage(), 2*size)
+
+        with tempfile.TemporaryDirectory() as directory:
+            manager = MazeManager(memory_budget=2*size, spill_directory=directory)
+            mazes = [manager.add_existing_maze(Maze(10, 10, algorithm="kruskal", backend="packed"))
+                     for _ in range(3)]
+            self.assertEqual(manager.get_maze_count(), 3)
+            self.assertEqual(len(manager.get_mazes()), 2)
+
+            # the spilled maze is loaded again, evicting the least recently used one
+            loaded = manager.get_maze(mazes[0].id)
+            self.assertIsNot(loaded, mazes[0])
+            self.assertEqual(loaded.to_bytes(), mazes[0].to_bytes())
+            self.assertEqual(loaded.generation_path, mazes[0].generation_path)
+            self.assertNotIn(mazes[1].id, [maze.id for maze in manager.get_mazes()])
+
+            self.assertTrue(manager.remove_maze(mazes[1].id))
+            self.assertEqual(manager.get_maze_count(), 2)
+
+    def test_memory_budget_mmap(self):
+        """Test that spilled mmap mazes are loaded again into memory"""
+        with tempfile.TemporaryDirectory() as directory:
+            mazes = list()
+            for index in range(3):
+                maze = Maze(10, 10, algorithm="kruskal", backend="mmap", seed=index, quiet_mode=True,
+                            filename=os.path.join(directory, "mapped_{}.bin".format(index)))
+                self.assertEqual(maze.nbytes(), 0)
+                mazes.append(maze)
+
+            manager = MazeManager(memory_budget=0, spill_directory=os.path.join(directory, "spill"))
+            manager.set_quiet_mode(True)
+            for maze in mazes:
+                manager.add_existing_maze(maze)
+                manager.solve_maze(maze.id, "BreadthFirst")
+            self.assertEqual(len(manager.get_mazes()), 1)
+            self.assertEqual(manager.get_maze_count(), 3)
+
+            loaded = manager.get_maze(mazes[0].id)
+            self.assertEqual(loaded.backend, "packed")
+            self.assertEqual(loaded.to_bytes(), mazes[0].to_bytes())
+            self.assertEqual(loaded.solution_path, mazes[0].solution_path)
+
+    def test_memory_budget_drops_paths(self):
+        """Test that generation paths are dropped before any maze is evicted"""
+        size = Maze(10, 10, algorithm="dfs_backtrack", backend="packed").nbytes()
+        mazes = [Maze(10, 10, algorithm="dfs_backtrack", backend="packed", seed=seed, record_generation_path=True)
+                 for seed in range(3)]
+        paths = [list(maze.generation_path) for maze in mazes]
+        budget = 2*size + max(maze.nbytes() for maze in mazes)
+
+        manager = MazeManager(memory_budget=budget)
+        for maze in mazes:
+            manager.add_existing_maze(maze)
+        self.assertEqual(len(manager.get_mazes()), 3)
+        self.assertLessEqual(manager.get_memory_usage(), budget)
+        # the least recently used paths are dropped first, the path of the newest maze is kept
+        self.assertIsNotNone(mazes[0]._generation_path_builder)
+        self.assertIsNone(mazes[-1]._generation_path_builder)
+        self.assertEqual([maze.generation_path for maze in mazes], paths)
+
+        manager.remove_maze(mazes[-1].id)
+        self.assertNotIn(mazes[-1].id, manager._droppable)
+
     def test_set_filename(self):
         """Tests that the filename is getting set"""
         manager = MazeManager()
@@ -103,6 +194,38 @@ class TestMgr(unittest.TestCase):
         manager.set_quiet_mode(True)
         self.assertEqual(manager.quiet_mode, True)
 
+    def test_add_mazes(self):
+        """Test that batch generation gives the same mazes for any number of processes"""
+        batches = list()
+        for max_workers in [1, 3]:
+            manager = MazeManager()
+            batches.append(manager.add_mazes(4, 6, 7, algorithm="wilson", seed=11, max_workers=max_workers))
+            self.assertEqual(manager.get_maze_count(), 4)
+
+        for index, (maze, other) in enumerate(zip(*batches)):
+            self.assertEqual(maze.seed, derive_seed(11, index))
+            self.assertEqual(maze.to_bytes(), other.to_bytes())
+            self.assertEqual(maze.generation_path, other.generation_path)
+
+            # any maze of the batch can be generated again on its own
+            again = Maze(6, 7, algorithm="wilson", seed=derive_seed(11, index))
+            self.assertEqual(again.to_bytes(), maze.to_bytes())
+
+    def test_solve_many(self):
+        """Test that solving in a process pool gives the same paths as solving one by one"""
+        manager = MazeManager()
+        manager.set_quiet_mode(True)
+        for _ in range(5):
+            manager.add_maze(9, 11)
+
+        self.assertEqual(manager.solve_all("BreadthFirst", max_workers=2, chunksize=2), 5)
+        self.assertEqual(manager.solve_many([(0, "AStar"), (42, "AStar")], max_workers=2), 1)
+        for maze in manager.get_mazes():
+            method = "AStar" if maze.id == 0 else "BreadthFirst"
+            solution_path = maze.solution_path
+            manager.solve_maze(maze.id, method)
+            self.assertEqual(solution_path, maze.solution_path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+import pickle
+import unittest
+
+from src.maze import Maze
+from src.maze_path import MazePath
+
+
+class TestMazePath(unittest.TestCase):
+    def test_generation_path(self):
+        """Test that a path of cells behaves like a list of (row, col)"""
+        steps = [(0, 0), (0, 1), (1, 1), (2, 3)]
+        path = MazePath.from_steps(steps, 4)
+
+        self.assertEqual(len(path), 4)
+        self.assertEqual(list(path.values), [0, 1, 5, 11])
+        self.assertEqual(path[2], (1, 1))
+        self.assertEqual(path[-1], (2, 3))
+        self.assertEqual(path, steps)
+        self.assertEqual(steps, path)
+        self.assertEqual(list(reversed(path)), steps[::-1])
+        self.assertEqual(path.nbytes(), 4*path.values.itemsize)
+
+        # slices are paths again
+        self.assertIsInstance(path[1:3], MazePath)
+        self.assertEqual(path[1:3], steps[1:3])
+        self.assertNotEqual(path, steps[:3])
+        self.assertRaises(IndexError, path.__getitem__, 4)
+
+    def test_solution_path(self):
+        """Test that the backtracked flag is packed into the lowest bit"""
+        steps = [((0, 0), False), ((1, 0), True), ((0, 1), False)]
+        path = MazePath(3, flags=True)
+        path.append(steps[0])
+        path.append_cell(3, True)
+        path.extend(steps[2:])
+
+        self.assertEqual(list(path.values), [0, 7, 2])
+        self.assertEqual(path, steps)
+        self.assertEqual(list(path.cells()), [0, 3, 1])
+        self.assertEqual(set(step[0] for step in path if step[1]), {(1, 0)})
+        self.assertEqual(pickle.loads(pickle.dumps(path)), path)
+
+        # equal steps stored with another width are still equal
+        self.assertEqual(MazePath.from_steps(steps, 5, flags=True), path)
+        self.assertNotEqual(MazePath(3), path)
+
+    def test_wide(self):
+        """Test that the steps of mazes with 2**31 cells or more are stored as 64 bit integers"""
+        self.assertRaises(OverflowError, MazePath(70000, flags=True).append, ((40000, 5), False))
+
+        huge = Maze(2, 2, algorithm=None)
+        huge.num_rows, huge.num_cols = 40000, 70000
+        path = MazePath.for_maze(huge, flags=True)
+        self.assertTrue(path.is_wide())
+        self.assertFalse(MazePath.for_maze(Maze(3, 3), flags=True).is_wide())
+
+        steps = [((40000, 5), False), ((39999, 69999), True)]
+        path.extend(steps)
+        self.assertEqual(path, steps)
+        self.assertEqual(path[1:], steps[1:])
+        self.assertTrue(path[1:].is_wide())
+        self.assertEqual(MazePath(70000, True, path.values.tobytes(), wide=True), steps)
+
+    def test_maze_paths(self):
+        """Test that recorded and replayed generation paths are stored compactly"""
+        maze = Maze(6, 7, algorithm="dfs_backtrack", record_generation_path=True)
+        self.assertIsInstance(maze.generation_path, MazePath)
+        self.assertEqual(len(maze.generation_path), len(list(maze.generation_steps())))
+
+        maze.drop_generation_path()
+        self.assertIsInstance(maze.generation_path, MazePath)
+
+        for algorithm in ["bin_tree", "eller", "kruskal", "wilson", "tiled_backtrack"]:
+            self.assertIsInstance(Maze(6, 7, algorithm=algorithm).generation_path, MazePath)
+
+
+if __name__ == "__main__":
+    unittest.main()
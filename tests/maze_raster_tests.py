@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+import unittest
+import numpy as np
+
+from src.maze import Maze
+from src.maze_raster import render_maze, WALL_COLOR, BACKGROUND_COLOR, PATH_COLOR, BACKTRACK_COLOR, ENTRY_COLOR
+
+
+class TestRenderMaze(unittest.TestCase):
+    def test_walls(self):
+        """Test the wall pixels of a small maze"""
+        # (0, 0) - (0, 1) - (1, 1) is open, (1, 0) is closed
+        walls = [[15 & ~2, 15 & ~8 & ~4], [15, 15 & ~1]]
+        image = render_maze(walls, cell_pixels=4, wall_pixels=1)
+
+        self.assertEqual(image.shape, (9, 9, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        expected = np.array([[1, 1, 1, 1, 1, 1, 1, 1, 1],
+                             [1, 0, 0, 0, 0, 0, 0, 0, 1],
+                             [1, 0, 0, 0, 0, 0, 0, 0, 1],
+                             [1, 0, 0, 0, 0, 0, 0, 0, 1],
+                             [1, 1, 1, 1, 1, 0, 0, 0, 1],
+                             [1, 0, 0, 0, 1, 0, 0, 0, 1],
+                             [1, 0, 0, 0, 1, 0, 0, 0, 1],
+                             [1, 0, 0, 0, 1, 0, 0, 0, 1],
+                             [1, 1, 1, 1, 1, 1, 1, 1, 1]], dtype=bool)
+        self.assertTrue((np.all(image == WALL_COLOR, axis=2) == expected).all())
+        self.assertTrue(np.all(image[~expected] == BACKGROUND_COLOR))
+
+        self.assertRaises(ValueError, render_maze, walls, 4, 4)
+
+    def test_cells(self):
+        """Test that the entry and the cells of a solution are filled"""
+        walls = [[15 & ~2, 15 & ~8 & ~4], [15, 15 & ~1]]
+        path = [((0, 0), False), ((1, 0), False), ((1, 0), True), ((0, 1), False)]
+        image = render_maze(walls, 5, 2, entry_coor=(0, 0), solution_path=path)
+
+        self.assertEqual(image.shape, (12, 12, 3))
+        self.assertEqual(tuple(image[3, 3]), ENTRY_COLOR)
+        self.assertEqual(tuple(image[8, 3]), BACKTRACK_COLOR)
+        self.assertEqual(tuple(image[3, 8]), PATH_COLOR)
+        self.assertEqual(tuple(image[8, 8]), BACKGROUND_COLOR)
+
+    def test_maze(self):
+        """Test that the cells of a generated maze are open and the border is only open at the entry and exit"""
+        maze = Maze(20, 30, algorithm="kruskal", backend="packed")
+        image = render_maze(maze.get_wall_bits(), 6, 2)
+
+        is_wall = np.all(image == WALL_COLOR, axis=2)
+        self.assertEqual(is_wall.shape, (20*6 + 2, 30*6 + 2))
+        cells = is_wall[:-2, :-2].reshape(20, 6, 30, 6)[:, 2:, :, 2:]
+        self.assertFalse(cells.any())
+        border = np.concatenate([is_wall[0], is_wall[-1], is_wall[:, 0], is_wall[:, -1]])
+        self.assertEqual(np.count_nonzero(~border), 2*(6 - 2))
+
+if __name__ == "__main__":
+    unittest.main()
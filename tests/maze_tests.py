@@ -1,7 +1,11 @@
 from __future__ import absolute_import
+import io
+import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 
-from src.maze import Maze
+from src.maze import Maze, derive_seed, LAYOUT_NIBBLES, LAYOUT_BYTES
 from src.cell import Cell
 
 
@@ -45,6 +49,164 @@ class TestMaze(unittest.TestCase):
         neighbors = maze.find_neighbours(0, 1)
         self.assertIsNotNone(neighbors)
 
+    def test_seed(self):
+        """Test that a maze is generated the same way again from its seed"""
+        for algorithm in ["dfs_backtrack", "bin_tree", "eller", "kruskal", "wilson"]:
+            maze = Maze(8, 6, algorithm=algorithm)
+            again = Maze(8, 6, algorithm=algorithm, seed=maze.seed)
+            self.assertEqual(again.get_wall_bits().tolist(), maze.get_wall_bits().tolist())
+            self.assertEqual((again.entry_coor, again.exit_coor), (maze.entry_coor, maze.exit_coor))
+            self.assertEqual(again.generation_path, maze.generation_path)
+
+        self.assertNotEqual(derive_seed(3, 0), derive_seed(3, 1))
+        self.assertNotEqual(derive_seed(3, 1), derive_seed(4, 1))
+
+    def test_entry_exit(self):
+        """Test that explicit entries and exits must be different cells on the boundary"""
+        maze = Maze(5, 6, entry_coor=(4, 2), exit_coor=[0, 5])
+        self.assertEqual((maze.entry_coor, maze.exit_coor), ((4, 2), (0, 5)))
+
+        self.assertRaises(ValueError, Maze, 5, 6, entry_coor=(2, 2))
+        self.assertRaises(ValueError, Maze, 5, 6, exit_coor=(5, 0))
+        self.assertRaises(ValueError, Maze, 5, 6, exit_coor=(0, -1))
+        self.assertRaises(ValueError, Maze, 5, 6, entry_coor=(0, 3), exit_coor=(0, 3))
+
+    def test_to_bytes(self):
+        """Test that a maze survives the round trip through its byte string"""
+        maze = Maze(7, 9, algorithm="kruskal")
+        data = maze.to_bytes()
+        self.assertEqual(len(data), 24 + 7*9)
+
+        for backend in ["cells", "packed"]:
+            copy = Maze.from_bytes(data, id=4, backend=backend)
+            self.assertEqual(copy.id, 4)
+            self.assertEqual((copy.num_rows, copy.num_cols), (7, 9))
+            self.assertEqual(copy.entry_coor, maze.entry_coor)
+            self.assertEqual(copy.exit_coor, maze.exit_coor)
+            self.assertEqual(copy.grid[maze.exit_coor[0]][maze.exit_coor[1]].is_entry_exit, "exit")
+            self.assertEqual(copy.get_wall_bits().tolist(), maze.get_wall_bits().tolist())
+
+    def test_save_load(self):
+        """Test that a maze and its paths survive saving and loading in both layouts"""
+        maze = Maze(7, 9, algorithm="dfs_backtrack", seed=12)
+        maze.solution_path = [(maze.entry_coor, False), ((3, 3), True), (maze.exit_coor, False)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "maze.bin")
+            for layout in [LAYOUT_NIBBLES, LAYOUT_BYTES]:
+                maze.save(filename, layout=layout)
+                loaded = Maze.load(filename, id=2)
+                self.assertEqual(loaded.id, 2)
+                self.assertEqual((loaded.algorithm, loaded.seed), ("dfs_backtrack", 12))
+                self.assertEqual(loaded.to_bytes(), maze.to_bytes())
+                self.assertEqual(loaded.grid[maze.entry_coor[0]][maze.entry_coor[1]].is_entry_exit, "entry")
+                self.assertEqual(loaded.generation_path, maze.generation_path)
+                self.assertEqual(loaded.solution_path, maze.solution_path)
+
+            # without stored paths the generation path is replayed from the seed
+            maze.save(filename, paths=False)
+            self.assertLess(os.path.getsize(filename), 48 + 7*9)
+            loaded = Maze.load(filename, backend="cells")
+            self.assertIsNone(loaded.solution_path)
+            self.assertEqual(loaded.generation_path, maze.generation_path)
+
+            # seeds that are not 64 bit integers are not stored
+            maze = Maze(5, 6, algorithm="kruskal", seed="abc", record_generation_path=True)
+            maze.save(filename)
+            loaded = Maze.load(filename)
+            self.assertEqual(loaded.to_bytes(), maze.to_bytes())
+            # so the loaded path is never replayed from the seed drawn for the loaded maze
+            self.assertFalse(loaded.drop_generation_path())
+            self.assertEqual(loaded.generation_path, maze.generation_path)
+            loaded.save(filename, paths=False)
+            loaded = Maze.load(filename)
+            self.assertEqual(loaded.to_bytes(), maze.to_bytes())
+            self.assertFalse(loaded.generation_path)
+            steps = [coor for _, coor in loaded.generation_steps()]
+            self.assertEqual(steps[0], (0, 0))
+            self.assertEqual(len(set(steps)), 5*6)
+            restored = Maze.from_bytes(maze.to_bytes())
+            restored.algorithm = "kruskal"
+            restored.generation_path = maze.generation_path
+            self.assertFalse(restored.drop_generation_path())
+
+            # the replay starts at the same cell as the generator did
+            maze = Maze(7, 9, algorithm=None, seed=3, record_generation_path=True)
+            maze.generate_maze("dfs_backtrack", (4, 4))
+            self.assertEqual(maze.generation_path[0], (4, 4))
+            maze.save(filename, paths=False)
+            loaded = Maze.load(filename)
+            self.assertEqual(loaded.generation_path, maze.generation_path)
+
+            with open(filename, "wb") as file:
+                file.write(b"not a maze" * 10)
+            self.assertRaises(ValueError, Maze.load, filename)
+
+    def test_drop_generation_path(self):
+        """Test that a dropped generation path is replayed from the seed on the next access"""
+        for algorithm in ["dfs_backtrack", "bin_tree", "eller", "wilson"]:
+            maze = Maze(6, 8, algorithm=algorithm, seed=5, record_generation_path=True)
+            path = list(maze.generation_path)
+            size = maze.nbytes()
+
+            self.assertTrue(maze.drop_generation_path())
+            self.assertFalse(maze.drop_generation_path())
+            self.assertLess(maze.nbytes(), size)
+            # the replay does not output anything
+            output = io.StringIO()
+            with redirect_stdout(output):
+                self.assertEqual(maze.generation_path, path)
+            self.assertEqual(output.getvalue(), "")
+            self.assertTrue(maze.drop_generation_path())
+
+        # a path that was never created has nothing to drop
+        self.assertFalse(Maze(6, 8, algorithm="kruskal").drop_generation_path())
+
+    def test_mmap(self):
+        """Test generating a maze in a mapped file and opening the file again"""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "maze.bin")
+            maze = Maze(12, 15, algorithm="tiled_backtrack", backend="mmap", filename=filename, seed=3)
+            self.assertEqual(maze.adjacency().num_edges(), maze.grid_size - 1)
+            self.assertEqual(os.path.getsize(filename), 48 + 12*15)
+            maze.grid[0][0].visited = True
+            self.assertTrue(maze.grid[0][0].visited)
+            # the visited bitmap does not leave files behind
+            self.assertEqual(os.listdir(directory), ["maze.bin"])
+
+            reopened = Maze.load(filename, backend="mmap")
+            self.assertEqual(reopened.to_bytes(), maze.to_bytes())
+            self.assertEqual((reopened.algorithm, reopened.seed), ("tiled_backtrack", 3))
+            self.assertEqual(reopened.generation_path, maze.generation_path)
+            self.assertEqual(Maze.load(filename).to_bytes(), maze.to_bytes())
+            # opening the file does not change its header
+            self.assertEqual(Maze.load(filename).algorithm, "tiled_backtrack")
+
+            # changes to the walls end up in the file
+            reopened.set_wall_bits([[0]])
+            reopened.grid.flush()
+            self.assertEqual(Maze.load(filename).get_wall_bits()[0, 0], 0)
+
+            # a file opened read-only is not changed
+            with open(filename, "rb") as file:
+                content = file.read()
+            readonly = Maze.load(filename, backend="mmap", readonly=True)
+            self.assertEqual(readonly.to_bytes(), reopened.to_bytes())
+            readonly.reset_visited()
+            self.assertRaises(ValueError, readonly.set_wall_bits, [[15]])
+            with open(filename, "rb") as file:
+                self.assertEqual(file.read(), content)
+            self.assertRaises(ValueError, Maze.load, filename, readonly=True)
+            self.assertRaises(ValueError, Maze, 3, 3, backend="mmap", filename=filename, readonly=True)
+
+            # mazes saved with one byte per cell can be mapped, others not
+            copy_name = os.path.join(directory, "copy.bin")
+            maze.save(copy_name, layout=LAYOUT_BYTES)
+            self.assertEqual(Maze.load(copy_name, backend="mmap").to_bytes(), reopened.to_bytes())
+            maze.save(copy_name)
+            self.assertRaises(ValueError, Maze.load, copy_name, backend="mmap")
+            self.assertRaises(ValueError, Maze, 3, 3, backend="mmap")
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
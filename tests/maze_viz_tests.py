@@ -0,0 +1,37 @@
+from __future__ import absolute_import
+import unittest
+import numpy as np
+
+from src.maze import Maze
+from src.maze_viz import wall_segments
+
+
+class TestWallSegments(unittest.TestCase):
+    def test_runs(self):
+        """Test that walls continuing each other are merged into one segment"""
+        # (0, 0) - (0, 1) - (1, 1) is open, (1, 0) is closed
+        walls = [[15 & ~2, 15 & ~8 & ~4], [15, 15 & ~1]]
+        segments = sorted(tuple(map(tuple, segment)) for segment in wall_segments(walls, cell_size=2).tolist())
+
+        self.assertEqual(segments, [((0, 0), (0, 4)), ((0, 0), (4, 0)), ((0, 2), (2, 2)), ((0, 4), (4, 4)),
+                                    ((2, 2), (2, 4)), ((4, 0), (4, 4))])
+
+    def test_maze(self):
+        """Test that the runs cover exactly the walls of a generated maze"""
+        maze = Maze(15, 25, algorithm="kruskal", backend="packed")
+        walls = maze.get_wall_bits()
+        segments = wall_segments(walls)
+
+        num_walls = 0
+        for (x0, y0), (x1, y1) in segments.tolist():
+            self.assertTrue(x0 == x1 or y0 == y1)
+            num_walls += abs(x1 - x0) + abs(y1 - y0)
+        # every inner wall is shared by two cells, the border walls belong to one cell
+        bits = np.unpackbits(walls[..., np.newaxis], axis=2)[..., 4:].sum()
+        border = 2*(15 + 25) - 2      # the entry and exit are open
+        self.assertEqual(num_walls, (bits + border) // 2)
+        self.assertLess(len(segments), num_walls)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+from __future__ import absolute_import
+import unittest
+
+from src.packed_grid import PackedGrid
+from src.maze import Maze
+
+
+class TestPackedGrid(unittest.TestCase):
+    def test_ctor(self):
+        """Make sure that a new grid has all walls up and no visited cells."""
+        grid = PackedGrid(3, 4)
+
+        self.assertEqual(len(grid), 3)
+        self.assertEqual(len(grid[0]), 4)
+        self.assertEqual(grid.walls.shape, (3, 4))
+        self.assertEqual(len(grid.visited_bits), 2)
+        for row in grid:
+            for cell in row:
+                self.assertEqual(cell.walls, {"top": True, "right": True, "bottom": True, "left": True})
+                self.assertFalse(cell.visited)
+
+    def test_cell_view(self):
+        """Test that cell views read and write the shared buffers"""
+        grid = PackedGrid(3, 3)
+
+        grid[1][1].remove_walls(0, 1)
+        grid[0][1].remove_walls(1, 1)
+        self.assertFalse(grid[1][1].walls["top"])
+        self.assertFalse(grid[0][1].walls["bottom"])
+        self.assertFalse(grid[1][1].is_walls_between(grid[0][1]))
+        self.assertTrue(grid[1][1].is_walls_between(grid[1][2]))
+        self.assertEqual(grid.walls[1, 1], 14)
+
+        grid[2][2].walls["right"] = False
+        self.assertEqual(grid.walls[2, 2], 13)
+
+        grid[2][1].visited = True
+        self.assertTrue(grid[2][1].visited)
+        self.assertTrue(grid.is_visited(2, 1))
+        self.assertFalse(grid[2][2].visited)
+        grid.clear_visited()
+        self.assertFalse(grid[2][1].visited)
+
+    def test_entry_exit(self):
+        """Test the CellView::set_as_entry_exit method"""
+        grid = PackedGrid(3, 3)
+
+        grid[0][1].set_as_entry_exit("entry", 2, 2)
+        self.assertEqual(grid[0][1].is_entry_exit, "entry")
+        self.assertFalse(grid[0][1].walls["top"])
+        self.assertIsNone(grid[1][1].is_entry_exit)
+
+    def test_maze(self):
+        """Test that the generators work on a maze using the packed backend"""
+        for algorithm in ["dfs_backtrack", "bin_tree"]:
+            maze = Maze(6, 7, algorithm=algorithm, backend="packed")
+            self.assertIsInstance(maze.grid, PackedGrid)
+            self.assertNotEqual(maze.generation_path, list())
+
+            for row in maze.grid:
+                for cell in row:
+                    self.assertFalse(cell.visited)
+                    self.assertNotEqual(cell.walls, {"top": True, "right": True, "bottom": True, "left": True})
+
+    def test_nbytes(self):
+        """The packed grid needs a little more than one byte per cell"""
+        grid = PackedGrid(100, 100)
+        self.assertEqual(grid.nbytes(), 10000 + 1250)
+
+
+if __name__ == "__main__":
+    unittest.main()
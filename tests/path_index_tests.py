@@ -0,0 +1,46 @@
+from __future__ import absolute_import
+import random
+import unittest
+
+from src.maze import Maze
+from src.path_index import PathIndex
+from src.adjacency import Adjacency
+
+
+class TestPathIndex(unittest.TestCase):
+    def test_queries(self):
+        """Test distances and routes between random pairs of cells against distance fields"""
+        for algorithm in ["dfs_backtrack", "bin_tree", "wilson"]:
+            maze = Maze(11, 13, algorithm=algorithm, backend="packed")
+            index = maze.path_index()
+            self.assertIs(maze.path_index(), index)
+
+            for _ in range(30):
+                first = (random.randrange(maze.num_rows), random.randrange(maze.num_cols))
+                second = (random.randrange(maze.num_rows), random.randrange(maze.num_cols))
+
+                self.assertEqual(index.distance(first, second), maze.distance(first, source=second))
+                self.assertEqual(index.path(first, second), maze.path_to_source(first, source=second))
+
+    def test_lowest_common_ancestor(self):
+        """Test the common ancestor of cells in a comb shaped maze rooted in the corner"""
+        # the top row is a corridor and every column hangs below it
+        walls = [[15 & ~4 & ~2, 15 & ~4 & ~2 & ~8, 15 & ~4 & ~8],
+                 [15 & ~1 & ~4, 15 & ~1 & ~4, 15 & ~1 & ~4],
+                 [15 & ~1, 15 & ~1, 15 & ~1]]
+        index = PathIndex(Adjacency.from_wall_bits(walls), (0, 0))
+
+        self.assertEqual(index.lowest_common_ancestor((2, 1), (2, 2)), (0, 1))
+        self.assertEqual(index.lowest_common_ancestor((2, 1), (1, 1)), (1, 1))
+        self.assertEqual(index.distance((2, 0), (2, 2)), 6)
+        self.assertEqual(index.path((1, 2), (1, 1)), [(1, 2), (0, 2), (0, 1), (1, 1)])
+        self.assertEqual(index.path((1, 1), (1, 1)), [(1, 1)])
+
+    def test_not_perfect(self):
+        """The index refuses mazes that contain loops or unreachable cells"""
+        self.assertRaises(ValueError, PathIndex, Adjacency.from_wall_bits([[15, 15]]))
+        self.assertRaises(ValueError, PathIndex, Adjacency.from_wall_bits([[9, 3], [12, 6]]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
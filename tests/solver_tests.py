@@ -1,9 +1,21 @@
 from __future__ import absolute_import
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
-from src.solver import Solver
+from src.solver import Solver, AStar, BreadthFirst, BiDirectional, DepthFirstBacktracker, CorridorAStar, \
+    DiskBreadthFirst
+from src.maze import Maze
 
 
+def check_route(test, maze, route):
+    """Checks that a route leads from the entry to the exit through open passages only"""
+    test.assertEqual(route[0], maze.entry_coor)
+    test.assertEqual(route[-1], maze.exit_coor)
+    test.assertEqual(len(set(route)), len(route))
+    for (k, l), (k_next, l_next) in zip(route, route[1:]):
+        test.assertEqual(abs(k - k_next) + abs(l - l_next), 1)
+        test.assertFalse(maze.grid[k][l].is_walls_between(maze.grid[k_next][l_next]))
+
 
 class TestSolver(unittest.TestCase):
     def test_ctor(self):
@@ -12,6 +24,122 @@ class TestSolver(unittest.TestCase):
         self.assertEqual(solver.name, "")
         self.assertEqual(solver.quiet_mode, False)
 
+    def test_a_star(self):
+        """Test that A* finds the route and reports it in the solution path format"""
+        for backend in ["cells", "packed"]:
+            maze = Maze(12, 10, backend=backend)
+            solver = AStar(maze, quiet_mode=True)
+            path = solver.solve()
+
+            route = solver.get_path()
+            check_route(self, maze, route)
+            # the cells that are not backtracked, in order, are the route
+            self.assertEqual([cell for cell, backtracked in path if not backtracked], route)
+            self.assertEqual(path[-1], (maze.exit_coor, False))
+
+        # without any passages the exit can not be reached
+        solver = AStar(Maze(4, 4, algorithm=None), quiet_mode=True)
+        self.assertEqual(solver.solve(), [])
+        self.assertEqual(solver.get_path(), [])
+
+    def test_corridor_a_star(self):
+        """Test that A* on the corridor graph finds the shortest route, expanding fewer cells"""
+        for algorithm in ["dfs_backtrack", "kruskal"]:
+            maze = Maze(20, 20, algorithm=algorithm)
+            solver = CorridorAStar(maze, quiet_mode=True)
+            path = solver.solve()
+
+            route = solver.get_path()
+            check_route(self, maze, route)
+            self.assertEqual([cell for cell, backtracked in path if not backtracked], route)
+            self.assertEqual(len(route) - 1, maze.distance(maze.entry_coor))
+
+            # only junctions and dead ends are expanded, instead of every cell
+            a_star_path = AStar(maze, quiet_mode=True).solve()
+            self.assertLessEqual(len(path), len(a_star_path))
+
+    def test_disk_breadth_first(self):
+        """Test that breadth-first search on disk finds the same route as in memory"""
+        for algorithm in ["dfs_backtrack", "kruskal"]:
+            maze = Maze(14, 17, algorithm=algorithm, backend="packed")
+            solver = DiskBreadthFirst(maze, quiet_mode=True)
+            path = solver.solve()
+
+            route = solver.get_path()
+            check_route(self, maze, route)
+            self.assertEqual(path, [(cell, False) for cell in route])
+            self.assertEqual(len(route) - 1, maze.distance(maze.entry_coor))
+
+        # the exit can not be reached when all walls are up
+        maze = Maze(4, 4, algorithm=None)
+        self.assertEqual(DiskBreadthFirst(maze, quiet_mode=True).solve(), [])
+
+    def test_breadth_first(self):
+        """Test that breadth-first search returns the route with and without the trace"""
+        maze = Maze(15, 12, algorithm="kruskal")
+        solver = BreadthFirst(maze, quiet_mode=True)
+        path = solver.solve()
+
+        route = solver.get_path()
+        check_route(self, maze, route)
+        self.assertEqual([cell for cell, backtracked in path if not backtracked], route)
+        # every cell is visited at most once
+        self.assertEqual(len(set(cell for cell, _ in path)), len(path))
+
+        solver = BreadthFirst(maze, quiet_mode=True, trace=False)
+        self.assertEqual(solver.solve(), [(cell, False) for cell in route])
+
+        # a maze with all walls up has no route to the exit
+        maze = Maze(4, 4, algorithm=None)
+        for trace in [True, False]:
+            solver = BreadthFirst(maze, quiet_mode=True, trace=trace)
+            self.assertEqual(solver.solve(), [])
+            self.assertEqual(solver.get_path(), [])
+
+    def test_bi_directional(self):
+        """Test that the bidirectional search terminates with the same route as breadth-first search"""
+        for algorithm in ["dfs_backtrack", "bin_tree", "wilson"]:
+            for _ in range(5):
+                maze = Maze(9, 11, algorithm=algorithm)
+                solver = BiDirectional(maze, quiet_mode=True)
+                path = solver.solve()
+
+                route = solver.get_path()
+                check_route(self, maze, route)
+                self.assertEqual(set(cell for cell, backtracked in path if not backtracked), set(route))
+
+                breadth_first = BreadthFirst(maze, quiet_mode=True, trace=False)
+                breadth_first.solve()
+                self.assertEqual(route, breadth_first.get_path())
+
+    def test_repeated_solves(self):
+        """Test that solving does not modify the maze, so it can be solved again and concurrently"""
+        maze = Maze(10, 10, backend="packed")
+        walls = maze.get_wall_bits().copy()
+
+        solvers = [DepthFirstBacktracker, BreadthFirst, BiDirectional, AStar]
+
+        def solve(solver):
+            # the cells the solver never backtracked from form the route
+            path = solver.solve()
+            return (set(cell for cell, backtracked in path if not backtracked)
+                    - set(cell for cell, backtracked in path if backtracked))
+
+        route = solve(AStar(maze, quiet_mode=True))
+        for solver_class in solvers:
+            solver = solver_class(maze, quiet_mode=True)
+            for _ in range(3):
+                self.assertEqual(solve(solver), route)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            routes = list(executor.map(solve, [solver_class(maze, "brute-force", True)
+                                               for solver_class in solvers*4]))
+        for other_route in routes:
+            self.assertEqual(other_route, route)
+
+        self.assertTrue((maze.get_wall_bits() == walls).all())
+        self.assertFalse(any(cell.visited for row in maze.grid for cell in row))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file